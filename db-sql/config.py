@@ -35,6 +35,9 @@ REQUEST_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Appl
 APP_TITLE = "NSE Tradable Stocks Database Interface"
 CONSOLE_WIDTH = 60
 
+# Rows fetched per cursor round trip when streaming query results to CSV
+EXPORT_CHUNK_SIZE = 10000
+
 # Date format for database storage
 DATE_FORMAT = "%Y-%m-%d"
 
@@ -51,3 +54,89 @@ PANDAS_TO_SQLITE_TYPES = {
     'datetime64[ns]': 'DATE',
     'category': 'TEXT'
 }
+
+# Dashboard display settings (module scope so Streamlit reruns don't rebuild them)
+SMA_PERIODS = [20, 50]
+
+# Minimum seconds between forced garbage collections on dashboard reruns
+GC_INTERVAL_SECONDS = 60
+
+# Rows shown in the breakout opportunities table before truncating
+MAX_BREAKOUT_TABLE_ROWS = 200
+
+# Points plotted per symbol in the price trend chart; longer series are downsampled
+MAX_TREND_POINTS_PER_SYMBOL = 500
+
+CUSTOM_CSS = """
+<style>
+    .main-header {
+        font-size: 2.5rem;
+        font-weight: bold;
+        color: #1f77b4;
+        text-align: center;
+        margin-bottom: 2rem;
+    }
+    .metric-card {
+        background-color: #f0f2f6;
+        padding: 1rem;
+        border-radius: 0.5rem;
+        border-left: 4px solid #1f77b4;
+    }
+    .success-box {
+        background-color: #d4edda;
+        border: 1px solid #c3e6cb;
+        border-radius: 0.25rem;
+        padding: 0.75rem;
+        margin: 1rem 0;
+    }
+    .warning-box {
+        background-color: #fff3cd;
+        border: 1px solid #ffeaa7;
+        border-radius: 0.25rem;
+        padding: 0.75rem;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+# Color code by breakout status
+BREAKOUT_STATUS_COLORS = {
+    'Fresh Breakout Above': '#2ecc71',
+    'Fresh Breakdown Below': '#e74c3c',
+    'Holding Above': '#f39c12',
+    'Holding Below': '#ff6b6b',
+    'At SMA': '#95a5a6'
+}
+
+BREAKOUT_STATUS_EMOJI = {
+    'Fresh Breakout Above': '🟢',
+    'Fresh Breakdown Below': '🔴',
+    'Holding Above': '🟡',
+    'Holding Below': '🟠',
+    'At SMA': '⚪'
+}
+
+# Rename columns for better display, per SMA period
+BREAKOUT_COLUMN_MAPPINGS = {
+    period: {
+        'symbol': 'Symbol',
+        'close': 'Current Price',
+        f'sma_{period}': f'{period}-Day SMA',
+        'percentage_from_sma': '% From SMA',
+        'status_display': 'Breakout Status',
+        'volume': 'Volume',
+        'date': 'Date'
+    }
+    for period in SMA_PERIODS
+}
+
+ABOVE_SMA_COLUMN_MAPPINGS = {
+    period: {
+        'symbol': 'Symbol',
+        'close': 'Current Price',
+        f'sma_{period}': f'{period}-Day SMA',
+        'percentage_above_sma': '% Above SMA',
+        'date': 'Date'
+    }
+    for period in SMA_PERIODS
+}
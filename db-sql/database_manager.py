@@ -3,6 +3,7 @@ Unified database management module for NSE stocks data.
 This module handles all database operations including schema creation, connection management, and data population.
 """
 
+import os
 import sqlite3
 import pandas as pd
 from pathlib import Path
@@ -53,6 +54,24 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    def database_version(self) -> Tuple[Optional[int], ...]:
+        """
+        Modification times of the database file and its WAL file.
+
+        Committed writes land in the WAL first, so together these change whenever
+        the database does; callers use the tuple to invalidate in-memory caches.
+
+        Returns:
+            Tuple[Optional[int], ...]: st_mtime_ns of each file, or None if it doesn't exist
+        """
+        versions = []
+        for path in (self.db_file, f"{self.db_file}-wal"):
+            try:
+                versions.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                versions.append(None)
+        return tuple(versions)
+
     def map_pandas_dtype_to_sqlite(self, dtype) -> str:
         """
         Map pandas dtype to appropriate SQLite type.
@@ -233,6 +252,9 @@ class DatabaseManager:
 
                 self._log(f"Successfully created table and inserted {count} records")
 
+                # to_sql's replace drops the indexes along with the old table
+                self._create_master_list_indexes(cursor)
+
                 # Show sample data
                 if self.verbose:
                     self._show_sample_data(cursor)
@@ -244,6 +266,40 @@ class DatabaseManager:
             self._log(f"Error creating and populating table: {e}")
             return False
     
+    def _create_master_list_indexes(self, cursor: sqlite3.Cursor):
+        """Create covering indexes for the series filters and symbol lookups, if the columns exist."""
+        cursor.execute(f"PRAGMA table_info({self.table_name})")
+        columns = {col[1] for col in cursor.fetchall()}
+
+        if {'series', 'symbol'} <= columns:
+            # (series, symbol) serves per-series counts; (symbol, series) serves the
+            # symbol-ordered NOT IN filter and symbol lookups, both without table reads
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_series_symbol "
+                f"ON {self.table_name}(series, symbol)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table_name}_symbol_series "
+                f"ON {self.table_name}(symbol, series)"
+            )
+
+    def create_master_list_indexes(self) -> bool:
+        """
+        Add the master list indexes to an existing table (a no-op if the table is missing).
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            with self.get_connection() as conn:
+                self._create_master_list_indexes(conn.cursor())
+                conn.commit()
+                return True
+
+        except Exception as e:
+            self._log(f"Error creating master list indexes: {e}")
+            return False
+
     def _show_sample_data(self, cursor: sqlite3.Cursor, limit: int = 3):
         """Show sample data from the table."""
         try:
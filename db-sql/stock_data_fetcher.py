@@ -7,6 +7,8 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import requests
+import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 import time
@@ -31,6 +33,11 @@ class StockDataFetcher:
         self.verbose = verbose
         self.use_filtering = use_filtering
         self.db_manager = DatabaseManager(verbose=verbose)
+        # Stock lists per (use_popular_only, filtered), with the day and source versions they were read at
+        self._stock_list_cache = {}
+        # Last filtering summary and the (cache file mtime, day) it was built for
+        self._filtering_summary = None
+        self._filtering_summary_key = None
 
         # Initialize cached stock filter if enabled
         if self.use_filtering:
@@ -96,9 +103,6 @@ class StockDataFetcher:
         Returns:
             pd.DataFrame: Mock OHLCV data
         """
-        import random
-        from datetime import datetime, timedelta
-
         # Base price varies by stock
         base_prices = {
             'RELIANCE': 2500, 'TCS': 3500, 'HDFCBANK': 1600, 'INFY': 1400, 'HINDUNILVR': 2400,
@@ -419,6 +423,38 @@ class StockDataFetcher:
         self._log(f"Individual fetch completed: {successful_fetches} successful, {failed_fetches} failed out of {total_symbols} stocks")
         return results
 
+    def fetch_multiple_stocks_parallel(self, symbols: List[str], period: str = "3mo",
+                                       max_workers: int = 4) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch data for multiple stocks individually, overlapping the HTTP waits in a thread pool.
+
+        The pool size is the rate limit: at most max_workers requests are in flight at once.
+
+        Args:
+            symbols (List[str]): List of stock symbols
+            period (str): Period for data
+            max_workers (int): Maximum concurrent requests
+
+        Returns:
+            Dict[str, pd.DataFrame]: Dictionary mapping symbols to their data
+        """
+        if not symbols:
+            return {}
+
+        self._log(f"Fetching data for {len(symbols)} stocks with {max_workers} parallel requests...")
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = list(executor.map(lambda symbol: self.fetch_stock_data(symbol, period), symbols))
+
+        results = {}
+        for symbol, data in zip(symbols, fetched):
+            if data is not None:
+                # Calculate 20-day SMA
+                results[symbol] = self.calculate_sma(data, 20)
+
+        self._log(f"Parallel fetch completed: {len(results)} successful, {len(symbols) - len(results)} failed out of {len(symbols)} stocks")
+        return results
+
     def get_comprehensive_nse_stocks(self) -> List[str]:
         """
         Get a comprehensive list of NSE stocks for cloud deployment.
@@ -501,6 +537,12 @@ class StockDataFetcher:
         if apply_filters is None:
             apply_filters = self.use_filtering
 
+        key = (use_popular_only, bool(apply_filters and hasattr(self, 'cached_filter')))
+        version = (datetime.now().date(), self._stock_list_version())
+        cached = self._stock_list_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return list(cached[1])
+
         try:
             if use_popular_only:
                 # Get popular stocks that exist in our database
@@ -513,6 +555,8 @@ class StockDataFetcher:
                     self._log("Applying cached stock filtering...")
                     filtered_symbols = self.cached_filter.get_filtered_stocks()
                     self._log(f"Found {len(filtered_symbols)} cached filtered stocks")
+                    if filtered_symbols:
+                        self._stock_list_cache[key] = (version, tuple(filtered_symbols))
                     return filtered_symbols
                 else:
                     # Get all stocks without filtering
@@ -522,6 +566,7 @@ class StockDataFetcher:
             if result and result[1]:
                 symbols = [row[0] for row in result[1]]
                 self._log(f"Found {len(symbols)} stocks in database")
+                self._stock_list_cache[key] = (version, tuple(symbols))
                 return symbols
             else:
                 self._log("No stocks found in database, using fallback stock list")
@@ -540,6 +585,31 @@ class StockDataFetcher:
             else:
                 return self.get_comprehensive_nse_stocks()
 
+    def count_stocks(self, apply_filters: bool = None) -> int:
+        """
+        Count the stocks get_stocks_from_database would return, without fetching
+        the unfiltered symbol list when the database can count it.
+
+        Args:
+            apply_filters (bool): If True, count the filtered list. If None, uses instance setting.
+
+        Returns:
+            int: Number of stock symbols
+        """
+        if apply_filters is None:
+            apply_filters = self.use_filtering
+
+        # The filtered list comes from the filter cache, not SQL, so count what it returns
+        if apply_filters and hasattr(self, 'cached_filter'):
+            return len(self.get_stocks_from_database(apply_filters=True))
+
+        result = self.db_manager.execute_query("SELECT COUNT(DISTINCT symbol) FROM tradable_stocks")
+        if result and result[1] and result[1][0][0]:
+            return result[1][0][0]
+
+        # Empty or missing table: count the fallback list get_stocks_from_database would use
+        return len(self.get_stocks_from_database(apply_filters=False))
+
     def get_filtering_summary(self) -> Dict[str, int]:
         """
         Get summary of stock filtering performance.
@@ -551,6 +621,13 @@ class StockDataFetcher:
             return {"filtering_enabled": False}
 
         try:
+            # Cache currency and age depend on the day as well as the file contents
+            cache_file = self.cached_filter.cache.cache_file
+            mtime = cache_file.stat().st_mtime_ns if cache_file.exists() else None
+            key = (mtime, datetime.now().date())
+            if self._filtering_summary is not None and key == self._filtering_summary_key:
+                return dict(self._filtering_summary)
+
             cache_status = self.cached_filter.get_cache_status()
             summary = {
                 "filtering_enabled": True,
@@ -561,7 +638,9 @@ class StockDataFetcher:
                 "cache_age_days": cache_status.get("age_days", 0),
                 "processing_time_seconds": cache_status.get("processing_time_seconds")
             }
-            return summary
+            self._filtering_summary = summary
+            self._filtering_summary_key = key
+            return dict(summary)
         except Exception as e:
             self._log(f"Error getting filtering summary: {e}")
             return {"filtering_enabled": False, "error": str(e)}
@@ -574,6 +653,7 @@ class StockDataFetcher:
             enabled (bool): Whether to enable filtering
         """
         self.use_filtering = enabled
+        self.clear_stock_list_cache()
         if enabled and not hasattr(self, 'cached_filter'):
             self.cached_filter = CachedStockFilter(
                 min_market_cap_cr=100.0,
@@ -631,6 +711,7 @@ class StockDataFetcher:
             return []
 
         self._log("Force refreshing filter cache (this may take a while)...")
+        self.clear_stock_list_cache()
         return self.cached_filter.refresh_cache()
 
     def get_filter_cache_status(self) -> Dict:
@@ -655,4 +736,19 @@ class StockDataFetcher:
         if not self.use_filtering or not hasattr(self, 'cached_filter'):
             return False
 
+        self.clear_stock_list_cache()
         return self.cached_filter.clear_cache()
+
+    def _stock_list_version(self) -> Tuple:
+        """Versions of the database and filter cache file, so external writes invalidate remembered lists."""
+        cache_mtime = None
+        if hasattr(self, 'cached_filter'):
+            try:
+                cache_mtime = self.cached_filter.cache.cache_file.stat().st_mtime_ns
+            except OSError:
+                pass
+        return self.db_manager.database_version(), cache_mtime
+
+    def clear_stock_list_cache(self):
+        """Forget the stock lists remembered by get_stocks_from_database."""
+        self._stock_list_cache.clear()
@@ -3,6 +3,7 @@ Stock data manager for handling OHLCV data storage and retrieval.
 This module extends the database schema to include price and volume data.
 """
 
+import csv
 import sqlite3
 import pandas as pd
 from datetime import datetime, timedelta
@@ -11,7 +12,7 @@ from contextlib import contextmanager
 
 from database_manager import DatabaseManager
 from utils import print_step
-from config import DB_FILE, DATE_FORMAT
+from config import DB_FILE, DATE_FORMAT, EXPORT_CHUNK_SIZE
 
 
 class StockDataManager(DatabaseManager):
@@ -115,12 +116,33 @@ class StockDataManager(DatabaseManager):
         success &= self.create_indicators_table()
         
         if success:
+            self.enable_write_ahead_log()
+            self.create_master_list_indexes()
             self._log("✓ Extended database schema created successfully")
         else:
             self._log("✗ Failed to create extended database schema")
         
         return success
     
+    def enable_write_ahead_log(self) -> bool:
+        """
+        Switch the database file to WAL journaling (the setting persists in the file).
+
+        In WAL mode dashboard reads don't block on a running fetch, and the upserts'
+        synchronous=NORMAL commits only append to the log instead of fsyncing the database.
+
+        Returns:
+            bool: True if the database is in WAL mode
+        """
+        try:
+            with self.get_connection() as conn:
+                mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+                return mode.lower() == "wal"
+
+        except Exception as e:
+            self._log(f"Error enabling WAL journal mode: {e}")
+            return False
+
     def insert_price_data(self, data: pd.DataFrame) -> bool:
         """
         Insert or update OHLCV data into the price table using proper upsert logic.
@@ -132,19 +154,16 @@ class StockDataManager(DatabaseManager):
             bool: True if successful
         """
         try:
-            # Prepare data for insertion
-            df_to_insert = data.copy()
+            # Select only the columns we need (a new frame, so the caller's data is never touched)
+            required_columns = ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume']
+            df_to_insert = data[required_columns]
 
             # Ensure date is in string format
-            if 'date' in df_to_insert.columns:
-                df_to_insert['date'] = pd.to_datetime(df_to_insert['date']).dt.strftime(DATE_FORMAT)
-
-            # Select only the columns we need
-            required_columns = ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume']
-            df_to_insert = df_to_insert[required_columns]
+            df_to_insert = df_to_insert.assign(date=pd.to_datetime(df_to_insert['date']).dt.strftime(DATE_FORMAT))
 
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("PRAGMA synchronous=NORMAL")
 
                 # Create temporary table for bulk upsert
                 temp_table = f"{self.price_table}_temp"
@@ -205,24 +224,22 @@ class StockDataManager(DatabaseManager):
             bool: True if successful
         """
         try:
-            df_to_insert = data.copy()
-
-            # Ensure date is in string format
-            if 'date' in df_to_insert.columns:
-                df_to_insert['date'] = pd.to_datetime(df_to_insert['date']).dt.strftime(DATE_FORMAT)
-
-            # Select only the columns we need
+            # Select only the columns we need (a new frame, so the caller's data is never touched)
             available_columns = ['symbol', 'date']
             indicator_columns = ['sma_20', 'sma_50', 'rsi_14']
 
             for col in indicator_columns:
-                if col in df_to_insert.columns:
+                if col in data.columns:
                     available_columns.append(col)
 
-            df_to_insert = df_to_insert[available_columns]
+            df_to_insert = data[available_columns]
+
+            # Ensure date is in string format
+            df_to_insert = df_to_insert.assign(date=pd.to_datetime(df_to_insert['date']).dt.strftime(DATE_FORMAT))
 
             with self.get_connection() as conn:
                 cursor = conn.cursor()
+                cursor.execute("PRAGMA synchronous=NORMAL")
 
                 # Create temporary table for bulk upsert
                 temp_table = f"{self.indicators_table}_temp"
@@ -306,21 +323,72 @@ class StockDataManager(DatabaseManager):
             self._log(f"Error getting latest prices: {e}")
             return None
     
-    def get_stocks_near_sma_breakout(self, sma_period: int = 20, max_distance: float = 5.0) -> Optional[pd.DataFrame]:
+    def get_price_symbols(self) -> List[str]:
         """
-        Get stocks near SMA that are breaking out (within ±5% of SMA for fresh opportunities).
+        Get the distinct symbols that have price data.
+
+        Returns:
+            List[str]: Sorted symbols (empty on error)
+        """
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f"SELECT DISTINCT symbol FROM {self.price_table} ORDER BY symbol")
+                return [row[0] for row in cursor.fetchall()]
+
+        except Exception as e:
+            self._log(f"Error getting price symbols: {e}")
+            return []
+
+    def get_prices_for_symbols(self, symbols: List[str], limit_per_symbol: int = 100) -> Optional[pd.DataFrame]:
+        """
+        Get the most recent price rows for specific symbols, filtered in SQL.
 
         Args:
-            sma_period (int): SMA period (20 or 50)
-            max_distance (float): Maximum percentage distance from SMA (default 5%)
+            symbols (List[str]): Symbols to fetch
+            limit_per_symbol (int): Maximum number of recent records per symbol
 
         Returns:
-            Optional[pd.DataFrame]: Stocks near SMA breakout or None
+            Optional[pd.DataFrame]: Price data ordered by symbol and date, or None
         """
-        try:
-            sma_column = f"sma_{sma_period}"
+        if not symbols:
+            return None
 
+        try:
+            placeholders = ",".join("?" * len(symbols))
             query = f"""
+            SELECT symbol, date, open, high, low, close, volume
+            FROM (
+                SELECT symbol, date, open, high, low, close, volume,
+                       ROW_NUMBER() OVER (PARTITION BY symbol ORDER BY date DESC) as row_num
+                FROM {self.price_table}
+                WHERE symbol IN ({placeholders})
+            )
+            WHERE row_num <= ?
+            ORDER BY symbol, date
+            """
+
+            with self.get_connection() as conn:
+                df = pd.read_sql_query(query, conn, params=[*symbols, limit_per_symbol])
+                return df if not df.empty else None
+
+        except Exception as e:
+            self._log(f"Error getting prices for symbols: {e}")
+            return None
+
+    def _near_sma_breakout_query(self, sma_column: str) -> str:
+        """
+        Build the base SELECT for latest-day stocks within a distance of their SMA.
+
+        The single ``?`` placeholder is the maximum absolute percentage distance.
+
+        Args:
+            sma_column (str): Indicator column name (e.g. ``sma_20``)
+
+        Returns:
+            str: SQL query without ORDER BY / LIMIT
+        """
+        return f"""
             SELECT
                 p.symbol,
                 p.date,
@@ -352,45 +420,107 @@ class StockDataManager(DatabaseManager):
                     SELECT MAX(date) FROM {self.price_table} p2
                     WHERE p2.symbol = p.symbol
                 )
+            """
+
+    def get_stocks_near_sma_breakout(self, sma_period: int = 20, max_distance: float = 5.0) -> Optional[pd.DataFrame]:
+        """
+        Get stocks near SMA that are breaking out (within ±5% of SMA for fresh opportunities).
+
+        Args:
+            sma_period (int): SMA period (20 or 50)
+            max_distance (float): Maximum percentage distance from SMA (default 5%)
+
+        Returns:
+            Optional[pd.DataFrame]: Stocks near SMA breakout or None
+        """
+        return self.get_top_breakout_opportunities(sma_period, max_distance, limit=None)
+
+    def get_top_breakout_opportunities(self, sma_period: int = 20, max_distance: float = 5.0,
+                                       limit: Optional[int] = 10) -> Optional[pd.DataFrame]:
+        """
+        Get the highest-ranked stocks near SMA breakout, limited in SQL.
+
+        Fresh breakouts come first, then fresh breakdowns, then the rest by
+        distance from the SMA (closest first).
+
+        Args:
+            sma_period (int): SMA period (20 or 50)
+            max_distance (float): Maximum percentage distance from SMA
+            limit (Optional[int]): Maximum rows to return (None for all)
+
+        Returns:
+            Optional[pd.DataFrame]: Top breakout opportunities or None
+        """
+        try:
+            sma_column = f"sma_{sma_period}"
+
+            query = self._near_sma_breakout_query(sma_column) + """
             ORDER BY
-                CASE
-                    WHEN p.close > i.{sma_column} AND p.open <= i.{sma_column} THEN 1  -- Fresh breakouts first
-                    WHEN p.close < i.{sma_column} AND p.open >= i.{sma_column} THEN 2  -- Fresh breakdowns second
+                CASE breakout_status
+                    WHEN 'Fresh Breakout Above' THEN 1  -- Fresh breakouts first
+                    WHEN 'Fresh Breakdown Below' THEN 2  -- Fresh breakdowns second
                     ELSE 3
                 END,
-                ABS((p.close - i.{sma_column}) / i.{sma_column} * 100) ASC  -- Closest to SMA first
+                ABS(percentage_from_sma) ASC  -- Closest to SMA first
             """
+            params = [max_distance]
+            if limit is not None:
+                query += "LIMIT ?"
+                params.append(limit)
 
             with self.get_connection() as conn:
-                df = pd.read_sql_query(query, conn, params=(max_distance,))
+                df = pd.read_sql_query(query, conn, params=params)
                 return df if not df.empty else None
 
         except Exception as e:
             self._log(f"Error getting stocks near SMA breakout: {e}")
             return None
 
-    def get_stocks_above_sma(self, sma_period: int = 20, max_distance: float = None) -> Optional[pd.DataFrame]:
+    def get_breakout_status_counts(self, sma_period: int = 20, max_distance: float = 5.0) -> Optional[pd.DataFrame]:
         """
-        Get stocks currently trading above their SMA (legacy method for compatibility).
+        Count stocks near their SMA per breakout status, aggregated in SQL.
 
         Args:
             sma_period (int): SMA period (20 or 50)
-            max_distance (float): Maximum percentage above SMA (None for no limit)
+            max_distance (float): Maximum percentage distance from SMA
 
         Returns:
-            Optional[pd.DataFrame]: Stocks above SMA or None
+            Optional[pd.DataFrame]: One row per breakout_status with stock_count and
+            avg_distance (mean absolute % from SMA), largest group first, or None
         """
         try:
             sma_column = f"sma_{sma_period}"
 
-            # Build query with optional distance filter
-            distance_filter = ""
-            params = []
-            if max_distance is not None:
-                distance_filter = f"AND ((p.close - i.{sma_column}) / i.{sma_column} * 100) <= ?"
-                params.append(max_distance)
-
             query = f"""
+            SELECT
+                breakout_status,
+                COUNT(*) as stock_count,
+                AVG(ABS(percentage_from_sma)) as avg_distance
+            FROM ({self._near_sma_breakout_query(sma_column)})
+            GROUP BY breakout_status
+            ORDER BY stock_count DESC
+            """
+
+            with self.get_connection() as conn:
+                df = pd.read_sql_query(query, conn, params=(max_distance,))
+                return df if not df.empty else None
+
+        except Exception as e:
+            self._log(f"Error getting breakout status counts: {e}")
+            return None
+
+    def _stocks_above_sma_query(self, sma_column: str, distance_filter: str = "") -> str:
+        """
+        Build the base SELECT for latest-day stocks closing above their SMA.
+
+        Args:
+            sma_column (str): Indicator column name (e.g. ``sma_20``)
+            distance_filter (str): Optional extra ``AND`` condition on the distance
+
+        Returns:
+            str: SQL query without ORDER BY
+        """
+        return f"""
             SELECT
                 p.symbol,
                 p.date,
@@ -406,6 +536,31 @@ class StockDataManager(DatabaseManager):
                     SELECT MAX(date) FROM {self.price_table} p2
                     WHERE p2.symbol = p.symbol
                 )
+            """
+
+    def get_stocks_above_sma(self, sma_period: int = 20, max_distance: float = None) -> Optional[pd.DataFrame]:
+        """
+        Get stocks currently trading above their SMA (legacy method for compatibility).
+
+        Args:
+            sma_period (int): SMA period (20 or 50)
+            max_distance (float): Maximum percentage above SMA (None for no limit)
+
+        Returns:
+            Optional[pd.DataFrame]: Stocks above SMA or None
+        """
+        try:
+            sma_column = f"sma_{sma_period}"
+
+            # Build query with optional distance filter
+            distance_filter = ""
+            params = []
+            if max_distance is not None:
+                distance_filter = f"AND ((p.close - i.{sma_column}) / i.{sma_column} * 100) <= ?"
+                params.append(max_distance)
+
+            query = f"""
+            {self._stocks_above_sma_query(sma_column, distance_filter)}
             ORDER BY percentage_above_sma ASC
             """
 
@@ -417,15 +572,14 @@ class StockDataManager(DatabaseManager):
             self._log(f"Error getting stocks above SMA: {e}")
             return None
     
-    def get_open_high_patterns(self) -> Optional[pd.DataFrame]:
+    def _open_high_patterns_query(self) -> str:
         """
-        Get stocks with open=high patterns.
-        
+        Build the base query for yesterday's open=high stocks that closed above that high today.
+
         Returns:
-            Optional[pd.DataFrame]: Stocks with patterns or None
+            str: SQL query without ORDER BY
         """
-        try:
-            query = f"""
+        return f"""
             WITH latest_dates AS (
                 SELECT symbol, MAX(date) as latest_date
                 FROM {self.price_table}
@@ -464,6 +618,51 @@ class StockDataManager(DatabaseManager):
             FROM yesterday_data y
             JOIN today_data t ON y.symbol = t.symbol
             WHERE t.today_close > y.yesterday_high
+            """
+
+    def get_summary_counts(self, sma_period: int = 20) -> Optional[Dict[str, int]]:
+        """
+        Count stocks above their SMA, open=high breakouts and stocks with data in one query.
+
+        Args:
+            sma_period (int): SMA period used for the above-SMA count
+
+        Returns:
+            Optional[Dict[str, int]]: Counts keyed like the analyzer's summary statistics, or None
+        """
+        try:
+            sma_column = f"sma_{sma_period}"
+
+            query = f"""
+            SELECT
+                (SELECT COUNT(*) FROM ({self._stocks_above_sma_query(sma_column)})) as stocks_above_sma,
+                (SELECT COUNT(*) FROM ({self._open_high_patterns_query()})) as open_high_patterns,
+                (SELECT COUNT(DISTINCT symbol) FROM {self.price_table}) as total_stocks_with_data
+            """
+
+            with self.get_connection() as conn:
+                above_sma, open_high, total = conn.execute(query).fetchone()
+
+            return {
+                f'stocks_above_{sma_period}_sma': above_sma,
+                'open_high_patterns': open_high,
+                'total_stocks_with_data': total,
+            }
+
+        except Exception as e:
+            self._log(f"Error getting summary counts: {e}")
+            return None
+
+    def get_open_high_patterns(self) -> Optional[pd.DataFrame]:
+        """
+        Get stocks with open=high patterns.
+        
+        Returns:
+            Optional[pd.DataFrame]: Stocks with patterns or None
+        """
+        try:
+            query = f"""
+            {self._open_high_patterns_query()}
             ORDER BY breakout_percentage DESC
             """
             
@@ -475,6 +674,81 @@ class StockDataManager(DatabaseManager):
             self._log(f"Error getting open=high patterns: {e}")
             return None
     
+    def _export_query_to_csv(self, query: str, path, params: tuple = ()) -> int:
+        """
+        Stream a query's rows to a CSV file in cursor chunks without building a DataFrame.
+
+        The file is only created when the query returns at least one row.
+
+        Args:
+            query (str): SQL query to export
+            path: Destination file path
+            params (tuple): Query parameters
+
+        Returns:
+            int: Number of rows written
+        """
+        rows_written = 0
+
+        with self.get_connection() as conn:
+            cursor = conn.execute(query, params)
+            rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+            if not rows:
+                return 0
+
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow([column[0] for column in cursor.description])
+                while rows:
+                    writer.writerows(rows)
+                    rows_written += len(rows)
+                    rows = cursor.fetchmany(EXPORT_CHUNK_SIZE)
+
+        return rows_written
+
+    def export_stocks_above_sma_to_csv(self, path, sma_period: int = 20) -> Optional[int]:
+        """
+        Export stocks currently trading above their SMA straight from the database to CSV.
+
+        Args:
+            path: Destination file path
+            sma_period (int): SMA period (20 or 50)
+
+        Returns:
+            Optional[int]: Number of rows written (0 writes no file), or None on error
+        """
+        try:
+            query = f"""
+            {self._stocks_above_sma_query(f"sma_{sma_period}")}
+            ORDER BY percentage_above_sma ASC
+            """
+            return self._export_query_to_csv(query, path)
+
+        except Exception as e:
+            self._log(f"Error exporting stocks above SMA: {e}")
+            return None
+
+    def export_open_high_patterns_to_csv(self, path) -> Optional[int]:
+        """
+        Export open=high breakout patterns straight from the database to CSV.
+
+        Args:
+            path: Destination file path
+
+        Returns:
+            Optional[int]: Number of rows written (0 writes no file), or None on error
+        """
+        try:
+            query = f"""
+            {self._open_high_patterns_query()}
+            ORDER BY breakout_percentage DESC
+            """
+            return self._export_query_to_csv(query, path)
+
+        except Exception as e:
+            self._log(f"Error exporting open=high patterns: {e}")
+            return None
+
     def cleanup_old_data(self, days_to_keep: int = 90) -> bool:
         """
         Clean up old price and indicator data.
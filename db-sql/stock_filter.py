@@ -4,6 +4,7 @@ Filters out irrelevant stocks to improve performance and focus on tradeable secu
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from typing import List, Dict, Optional, Tuple
@@ -27,7 +28,8 @@ class StockFilter:
     def __init__(self, 
                  min_market_cap_cr: float = 100.0,  # 100 crores
                  min_daily_value_l: float = 10.0,   # 10 lakhs INR
-                 verbose: bool = True):
+                 verbose: bool = True,
+                 exclude_series: Tuple[str, ...] = ('BE', 'BZ')):
         """
         Initialize the stock filter.
         
@@ -35,16 +37,22 @@ class StockFilter:
             min_market_cap_cr: Minimum market cap in crores (default: 100)
             min_daily_value_l: Minimum daily trading value in lakhs (default: 10)
             verbose: Whether to print detailed information
+            exclude_series: Series excluded by default in get_stocks_by_series
         """
         self.min_market_cap_cr = min_market_cap_cr
         self.min_daily_value_l = min_daily_value_l
         self.verbose = verbose
+        self._excluded_series = frozenset(exclude_series)
         self.db_manager = DatabaseManager(verbose=verbose)
         
         # Cache for filtered stocks to avoid repeated calculations
         self._filtered_stocks_cache = None
         self._cache_timestamp = None
         self._cache_duration_hours = 24  # Cache for 24 hours
+
+        # Last filter summary and the (database version, filter cache timestamp) it was built from
+        self._summary_cache = None
+        self._summary_key = None
     
     def _log(self, message: str):
         """Print message if verbose mode is enabled."""
@@ -56,13 +64,13 @@ class StockFilter:
         Get stocks filtered by series (category).
         
         Args:
-            excluded_series: List of series to exclude (default: ['BE', 'BZ'])
+            excluded_series: List of series to exclude (default: the series given at init)
             
         Returns:
             List of stock symbols that pass the series filter
         """
-        if excluded_series is None:
-            excluded_series = ['BE', 'BZ']
+        # Sorted so the same exclusions always produce the same SQL parameters
+        excluded_series = sorted(self._excluded_series if excluded_series is None else set(excluded_series))
         
         try:
             # Build the exclusion condition
@@ -126,36 +134,34 @@ class StockFilter:
                 self._log("No bulk data returned from yfinance")
                 return {}
 
+            # One Tickers object shares its HTTP session across all market cap lookups
+            tickers = yf.Tickers(' '.join(yf_symbols)).tickers
+            grouped = isinstance(bulk_data.columns, pd.MultiIndex)
+            downloaded = set(bulk_data.columns.get_level_values(0)) if grouped else set()
+
             # Process each stock
-            for i, symbol in enumerate(sample_symbols):
+            for symbol, yf_symbol in zip(sample_symbols, yf_symbols):
                 try:
-                    yf_symbol = yf_symbols[i]
-
-                    # Get ticker info for market cap
-                    ticker = yf.Ticker(yf_symbol)
-                    info = ticker.info
-
-                    # Extract market cap
-                    market_cap_inr = info.get('marketCap', 0)
+                    # fast_info.market_cap is price * shares, far lighter than the full info scrape
+                    market_cap_inr = tickers[yf_symbol].fast_info.market_cap
                     market_cap_cr = 0
                     if market_cap_inr and market_cap_inr > 0:
                         market_cap_cr = market_cap_inr / 10_000_000  # Convert to crores
 
                     # Extract trading volume from historical data
                     avg_trading_value_l = 0
-                    if len(yf_symbols) == 1:
-                        # Single stock case
+                    if not grouped:
+                        # Flat columns (older yfinance, single stock)
                         hist_data = bulk_data
                     else:
-                        # Multiple stocks case
-                        hist_data = bulk_data[yf_symbol] if yf_symbol in bulk_data.columns.get_level_values(0) else pd.DataFrame()
+                        hist_data = bulk_data[yf_symbol] if yf_symbol in downloaded else pd.DataFrame()
 
                     if not hist_data.empty and 'Close' in hist_data.columns and 'Volume' in hist_data.columns:
                         # Calculate average daily trading value
                         hist_data_clean = hist_data.dropna()
                         if len(hist_data_clean) > 0:
-                            trading_values = hist_data_clean['Close'] * hist_data_clean['Volume']
-                            avg_trading_value = trading_values.mean()
+                            close = hist_data_clean['Close'].to_numpy()
+                            avg_trading_value = float(np.dot(close, hist_data_clean['Volume'].to_numpy())) / close.size
                             if avg_trading_value and avg_trading_value > 0:
                                 avg_trading_value_l = avg_trading_value / 100_000  # Convert to lakhs
 
@@ -288,8 +294,9 @@ class StockFilter:
                     # Calculate average daily trading value
                     data_clean = data.dropna()
                     if len(data_clean) > 0:
-                        trading_values = data_clean['Close'] * data_clean['Volume']
-                        avg_trading_value = trading_values.mean()
+                        # Mean of Close * Volume as one dot product, without a temporary Series
+                        close = data_clean['Close'].to_numpy()
+                        avg_trading_value = float(np.dot(close, data_clean['Volume'].to_numpy())) / close.size
                         avg_trading_value_l = avg_trading_value / 100_000  # Convert to lakhs
 
                         if avg_trading_value_l < self.min_daily_value_l:
@@ -351,25 +358,36 @@ class StockFilter:
         Returns:
             Dictionary with filtering statistics
         """
-        # Get total stocks
-        result = self.db_manager.execute_query("SELECT COUNT(*) FROM tradable_stocks")
-        total_stocks = result[1][0][0] if result and result[1] else 0
-        
-        # Get stocks by series
-        series_filtered = self.get_stocks_by_series()
-        
-        # Get final filtered stocks
+        # Get final filtered stocks (served from the in-memory cache while it is fresh)
         final_filtered = self.get_filtered_stocks()
+
+        key = (self.db_manager.database_version(), self._cache_timestamp)
+        if self._summary_cache is not None and key == self._summary_key:
+            return dict(self._summary_cache)
+
+        # Total stocks and those passing the series filter, counted in one scan
+        excluded_series = sorted(self._excluded_series)
+        placeholders = ','.join(['?' for _ in excluded_series])
+        result = self.db_manager.execute_query(
+            f"SELECT COUNT(*), SUM(series NOT IN ({placeholders})) FROM tradable_stocks",
+            excluded_series
+        )
+        total_stocks, after_series = result[1][0] if result and result[1] else (0, 0)
+        after_series = after_series or 0
         
-        return {
+        summary = {
             'total_stocks': total_stocks,
-            'after_series_filter': len(series_filtered),
+            'after_series_filter': after_series,
             'final_filtered': len(final_filtered),
-            'be_bz_excluded': total_stocks - len(series_filtered),
+            'be_bz_excluded': total_stocks - after_series,
             'total_excluded': total_stocks - len(final_filtered),
             'efficiency_gain_percent': round((total_stocks - len(final_filtered)) / total_stocks * 100, 1)
         }
 
+        self._summary_cache = summary
+        self._summary_key = key
+        return dict(summary)
+
 
 def main():
     """Test the stock filtering system."""
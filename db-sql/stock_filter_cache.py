@@ -4,12 +4,15 @@ Implements date-stamped caching to avoid expensive filtering operations.
 """
 
 import json
+import gzip
 import os
 from datetime import datetime, date
 from typing import List, Dict, Optional, Tuple
 import time
 from pathlib import Path
 
+from optimized_stock_filter import OptimizedStockFilter
+
 
 class StockFilterCache:
     """
@@ -24,11 +27,15 @@ class StockFilterCache:
         Initialize the stock filter cache.
         
         Args:
-            cache_file: Path to the cache file
+            cache_file: Path to the cache file (a ".gz" suffix stores it gzip-compressed)
             verbose: Whether to print detailed logs
         """
         self.cache_file = Path(cache_file)
+        self.compressed = self.cache_file.suffix == ".gz"
         self.verbose = verbose
+        # Parsed cache contents and the (mtime_ns, size) of the file they were read from
+        self._parsed = None
+        self._parsed_key = None
     
     def _log(self, message: str):
         """Print message if verbose mode is enabled."""
@@ -39,6 +46,24 @@ class StockFilterCache:
         """Get today's date as a string."""
         return date.today().isoformat()
     
+    def _file_key(self) -> Tuple[int, int]:
+        """Identify the current cache file contents by modification time and size."""
+        stat = self.cache_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read_cache_data(self) -> Dict:
+        """Read and parse the cache file in a single binary read, reusing the last parse if the file is unchanged."""
+        key = self._file_key()
+        if self._parsed is not None and key == self._parsed_key:
+            return self._parsed
+
+        raw = self.cache_file.read_bytes()
+        if self.compressed:
+            raw = gzip.decompress(raw)
+        self._parsed = json.loads(raw)
+        self._parsed_key = key
+        return self._parsed
+    
     def save_filtered_stocks(self, 
                            symbols: List[str], 
                            filter_criteria: Dict = None,
@@ -55,8 +80,9 @@ class StockFilterCache:
             True if saved successfully
         """
         try:
+            today = self._get_today_string()
             cache_data = {
-                "date": self._get_today_string(),
+                "date": today,
                 "timestamp": datetime.now().isoformat(),
                 "symbols": symbols,
                 "count": len(symbols),
@@ -65,10 +91,19 @@ class StockFilterCache:
                 "cache_version": "1.0"
             }
             
-            with open(self.cache_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
+            # Compact separators keep the file small and let the C encoder do all the work
+            payload = json.dumps(cache_data, separators=(',', ':')).encode()
+            if self.compressed:
+                # Fastest compression level: the symbol list is highly repetitive ASCII
+                payload = gzip.compress(payload, compresslevel=1)
+            # Write beside the cache and swap it in so readers never see a partial file
+            tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self.cache_file)
+            self._parsed = dict(cache_data, symbols=list(symbols))
+            self._parsed_key = self._file_key()
             
-            self._log(f"Saved {len(symbols)} filtered stocks to cache for {self._get_today_string()}")
+            self._log(f"Saved {len(symbols)} filtered stocks to cache for {today}")
             return True
             
         except Exception as e:
@@ -90,8 +125,7 @@ class StockFilterCache:
                 self._log("No cache file found")
                 return None
             
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = self._read_cache_data()
             
             cached_date = cache_data.get("date")
             today = self._get_today_string()
@@ -100,7 +134,8 @@ class StockFilterCache:
                 self._log(f"Cache is stale (cached: {cached_date}, today: {today})")
                 return None
             
-            symbols = cache_data.get("symbols", [])
+            # A copy, so callers can't alter the parsed cache kept for later loads
+            symbols = list(cache_data.get("symbols", []))
             metadata = {
                 "date": cached_date,
                 "timestamp": cache_data.get("timestamp"),
@@ -128,8 +163,7 @@ class StockFilterCache:
             if not self.cache_file.exists():
                 return False
             
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = self._read_cache_data()
             
             cached_date = cache_data.get("date")
             today = self._get_today_string()
@@ -155,11 +189,11 @@ class StockFilterCache:
             }
         
         try:
-            with open(self.cache_file, 'r') as f:
-                cache_data = json.load(f)
+            cache_data = self._read_cache_data()
             
             cached_date = cache_data.get("date")
-            today = self._get_today_string()
+            today_date = date.today()
+            today = today_date.isoformat()
             
             return {
                 "exists": True,
@@ -169,7 +203,7 @@ class StockFilterCache:
                 "count": cache_data.get("count", 0),
                 "processing_time_seconds": cache_data.get("processing_time_seconds"),
                 "is_stale": cached_date != today,
-                "age_days": (date.today() - date.fromisoformat(cached_date)).days if cached_date else None
+                "age_days": (today_date - date.fromisoformat(cached_date)).days if cached_date else None
             }
             
         except Exception as e:
@@ -224,9 +258,6 @@ class CachedStockFilter:
         self.min_daily_value_l = min_daily_value_l
         self.verbose = verbose
         self.cache = StockFilterCache(cache_file, verbose)
-        
-        # Import here to avoid circular imports
-        from optimized_stock_filter import OptimizedStockFilter
         self.fast_filter = OptimizedStockFilter(min_daily_value_l, verbose)
     
     def _log(self, message: str):
@@ -4,63 +4,44 @@ A modern web-based interface for stock analysis and screening.
 """
 
 import streamlit as st
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.csv as pa_csv
 from datetime import datetime, timedelta
 import time
 import os
+import io
+import functools
+import hashlib
+import gc
+from concurrent.futures import ThreadPoolExecutor
 
 # Import our modules
 from technical_analysis import TechnicalAnalyzer
 from stock_data_fetcher import StockDataFetcher
 from stock_data_manager import StockDataManager
 from streamlit_streaming import stream_stock_data_fetch
+from config import (
+    SMA_PERIODS, CUSTOM_CSS, BREAKOUT_STATUS_COLORS, BREAKOUT_STATUS_EMOJI,
+    BREAKOUT_COLUMN_MAPPINGS, ABOVE_SMA_COLUMN_MAPPINGS, GC_INTERVAL_SECONDS,
+    MAX_BREAKOUT_TABLE_ROWS, MAX_TREND_POINTS_PER_SYMBOL
+)
 
 # Page configuration
 st.set_page_config(
-    page_title="Stock Technical Analysis Dashboard",
+    page_title="SmartInk - Stock Analysis",
     page_icon="📈",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    .main-header {
-        font-size: 2.5rem;
-        font-weight: bold;
-        color: #1f77b4;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 0.5rem;
-        border-left: 4px solid #1f77b4;
-    }
-    .success-box {
-        background-color: #d4edda;
-        border: 1px solid #c3e6cb;
-        border-radius: 0.25rem;
-        padding: 0.75rem;
-        margin: 1rem 0;
-    }
-    .warning-box {
-        background-color: #fff3cd;
-        border: 1px solid #ffeaa7;
-        border-radius: 0.25rem;
-        padding: 0.75rem;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 # Initialize session state
-if 'analyzer' not in st.session_state:
-    st.session_state.analyzer = TechnicalAnalyzer(verbose=False)
 if 'data_fetched' not in st.session_state:
     st.session_state.data_fetched = False
 if 'last_fetch_time' not in st.session_state:
@@ -86,7 +67,8 @@ def show_cloud_warning():
 def check_data_availability():
     """Check if data is available and update session state accordingly."""
     try:
-        stats = st.session_state.analyzer.get_summary_statistics()
+        # Memoized until the next fetch bumps the data generation
+        stats = get_cached_summary_statistics()
         if stats and stats.get('total_stocks_with_data', 0) > 0:
             st.session_state.data_fetched = True
             return True
@@ -122,51 +104,168 @@ def ensure_data_is_fetched() -> bool:
     return True
 
 # Cached functions to avoid repeated database queries
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_summary_statistics(_analyzer):
+QUERY_CACHE_TTL = 300  # Cache query results for 5 minutes
+
+@st.cache_resource
+def get_analyzer():
+    """Get the process-wide analyzer (shared across sessions, never pickled)."""
+    return TechnicalAnalyzer(verbose=False)
+
+@st.cache_resource
+def get_data_generation():
+    """Process-wide counter bumped whenever stock data changes, invalidating every session's memo."""
+    return {'value': 0}
+
+def clear_cached_queries():
+    """Invalidate cached query results for all sessions."""
+    get_data_generation()['value'] += 1
+    st.cache_data.clear()
+
+def session_memo(func):
+    """
+    Memoize an analyzer query per session in st.session_state.
+
+    Unlike st.cache_data, results are returned as-is without a pickle round-trip
+    on every rerun. Entries expire after QUERY_CACHE_TTL seconds or when
+    clear_cached_queries() is called.
+    """
+    def store(result, *args, **kwargs):
+        """Put a result computed elsewhere (e.g. a pre-warm thread) into this session's memo."""
+        memo = st.session_state.setdefault('_qcache', {})
+        now = time.monotonic()
+        generation = get_data_generation()['value']
+        for stale_key in [k for k, v in memo.items() if v[0] <= now or v[1] != generation]:
+            del memo[stale_key]
+        memo[(func.__name__, args, tuple(sorted(kwargs.items())))] = (now + QUERY_CACHE_TTL, generation, result)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        memo = st.session_state.setdefault('_qcache', {})
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+
+        entry = memo.get(key)
+        if entry is not None and entry[0] > time.monotonic() and entry[1] == get_data_generation()['value']:
+            return entry[2]
+
+        result = func(*args, **kwargs)
+        store(result, *args, **kwargs)
+        return result
+
+    wrapper.store = store
+    return wrapper
+
+def prewarm_cached_queries(calls):
+    """
+    Run memoized queries concurrently and store the results in this session's memo.
+
+    Only the underlying queries run in worker threads; st.session_state is
+    touched from the script thread alone.
+
+    Args:
+        calls: List of (memoized_function, args) tuples, with args matching how
+            the pages call them so the memo keys line up
+    """
+    ctx = get_script_run_ctx()
+    with ThreadPoolExecutor(max_workers=4, initializer=lambda: add_script_run_ctx(ctx=ctx)) as executor:
+        futures = [(func, args, executor.submit(func.__wrapped__, *args)) for func, args in calls]
+
+    for func, args, future in futures:
+        try:
+            func.store(future.result(), *args)
+        except Exception:
+            pass  # The page will simply query again on demand
+
+def to_arrow_dtypes(df):
+    """Convert a query result to Arrow-backed dtypes (compact strings, cheaper hashing), passing None through."""
+    if df is None:
+        return None
+    return df.convert_dtypes(dtype_backend='pyarrow')
+
+@session_memo
+def get_cached_summary_statistics():
     """Get summary statistics with caching."""
-    return _analyzer.get_summary_statistics()
+    return get_analyzer().get_summary_statistics()
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_stocks_above_sma(_analyzer, sma_period, max_distance=None):
+@session_memo
+def get_cached_stocks_above_sma(sma_period, max_distance=None):
     """Get stocks above SMA with caching."""
-    return _analyzer.get_stocks_above_sma(sma_period, max_distance)
+    return to_arrow_dtypes(get_analyzer().get_stocks_above_sma(sma_period, max_distance))
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_stocks_near_sma_breakout(_analyzer, sma_period, max_distance=5.0):
+@session_memo
+def get_cached_stocks_near_sma_breakout(sma_period, max_distance=5.0):
     """Get stocks near SMA breakout with caching."""
-    return _analyzer.get_stocks_near_sma_breakout(sma_period, max_distance)
-
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_breakout_patterns(_analyzer):
+    return to_arrow_dtypes(get_analyzer().get_stocks_near_sma_breakout(sma_period, max_distance))
+
+@session_memo
+def get_cached_breakout_status_counts(sma_period, max_distance=5.0):
+    """Get per-status breakout counts (aggregated in SQL) with caching."""
+    counts = get_analyzer().get_breakout_status_counts(sma_period, max_distance)
+    if counts is None:
+        return None
+    return to_arrow_dtypes(counts).set_index('breakout_status')
+
+@session_memo
+def get_cached_top_breakout_opportunities(sma_period, max_distance=5.0, limit=10):
+    """Get the top breakout opportunities (limited in SQL) with caching."""
+    return to_arrow_dtypes(get_analyzer().get_top_breakout_opportunities(sma_period, max_distance, limit))
+
+@session_memo
+def get_cached_breakout_patterns():
     """Get breakout patterns with caching."""
-    return _analyzer.get_open_high_patterns()
+    return to_arrow_dtypes(get_analyzer().get_open_high_patterns())
+
+@session_memo
+def get_cached_latest_prices(limit=1000):
+    """Get latest prices with caching (Arrow-backed dtypes for compact string/numeric columns)."""
+    return to_arrow_dtypes(get_analyzer().data_manager.get_latest_prices(limit=limit))
+
+@session_memo
+def get_cached_data_overview(limit=1000):
+    """Get Data Explorer overview metrics with caching (computed once per data refresh)."""
+    latest_prices = get_cached_latest_prices(limit=limit)
+    if latest_prices is None:
+        return None
+    return {
+        'records': len(latest_prices),
+        'unique_symbols': latest_prices['symbol'].nunique(),
+        'unique_dates': latest_prices['date'].nunique(),
+        'avg_volume': latest_prices['volume'].mean()
+    }
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_latest_prices(_analyzer, limit=1000):
-    """Get latest prices with caching."""
-    return _analyzer.data_manager.get_latest_prices(limit=limit)
+@session_memo
+def get_cached_prices_for_symbols(symbols, limit_per_symbol=100):
+    """Get recent prices for a sorted tuple of symbols (filtered in SQL) with caching."""
+    return to_arrow_dtypes(get_analyzer().data_manager.get_prices_for_symbols(list(symbols), limit_per_symbol))
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_cached_master_stock_count(_analyzer):
+@session_memo
+def get_cached_symbol_options():
+    """Get the sorted symbols with price data for the Data Explorer selector with caching."""
+    return get_analyzer().data_manager.get_price_symbols()
+
+@session_memo
+def get_cached_master_stock_count():
     """Get count of stocks in master list with caching."""
     try:
-        symbols = _analyzer.fetcher.get_stocks_from_database()
-        return len(symbols) if symbols else 0
+        return len(get_analyzer().resolve_symbols())
     except Exception:
         return 0
 
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def df_to_csv_bytes(df_hash, _df):
+    """Serialize a DataFrame to CSV with PyArrow's C++ writer (cached per content hash)."""
+    buffer = io.BytesIO()
+    pa_csv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), buffer)
+    return buffer.getvalue()
+
+def to_csv_bytes(df):
+    """Get CSV bytes for download buttons, reusing the cached export when the data is unchanged."""
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    df_hash = (hashlib.blake2b(row_hashes.tobytes()).hexdigest(), tuple(df.columns))
+    return df_to_csv_bytes(df_hash, df)
+
 def main():
     """Main dashboard function."""
 
-    # Page configuration
-    st.set_page_config(
-        page_title="SmartInk - Stock Analysis",
-        page_icon="📈",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-
     # Header
     st.markdown('<h1 class="main-header">📈 SmartInk - Intelligent Stock Analysis</h1>', unsafe_allow_html=True)
     st.markdown("*Professional-grade stock analysis focusing on actionable trading opportunities*")
@@ -228,20 +327,19 @@ def main():
                 st.markdown("**📅 Daily Master List Cache**")
 
                 # Get cache status
-                if hasattr(st.session_state, 'analyzer') and st.session_state.analyzer:
-                    cache_status = st.session_state.analyzer.fetcher.get_filter_cache_status()
+                cache_status = get_analyzer().fetcher.get_filter_cache_status()
 
-                    if cache_status.get("exists", False):
-                        cache_date = cache_status.get("date", "Unknown")
-                        cache_count = cache_status.get("count", 0)
-                        is_current = cache_status.get("current", False)
+                if cache_status.get("exists", False):
+                    cache_date = cache_status.get("date", "Unknown")
+                    cache_count = cache_status.get("count", 0)
+                    is_current = cache_status.get("current", False)
 
-                        if is_current:
-                            st.success(f"✅ Current cache: {cache_count} stocks (today: {cache_date})")
-                        else:
-                            st.warning(f"⚠️ Stale cache: {cache_count} stocks (from: {cache_date})")
+                    if is_current:
+                        st.success(f"✅ Current cache: {cache_count} stocks (today: {cache_date})")
                     else:
-                        st.info("ℹ️ No cache found - will create on first use")
+                        st.warning(f"⚠️ Stale cache: {cache_count} stocks (from: {cache_date})")
+                else:
+                    st.info("ℹ️ No cache found - will create on first use")
 
                 # Cache management options
                 col1, col2 = st.columns(2)
@@ -253,12 +351,11 @@ def main():
                     )
                 with col2:
                     if st.button("🗑️ Clear Cache", help="Clear the cached master list"):
-                        if hasattr(st.session_state, 'analyzer') and st.session_state.analyzer:
-                            if st.session_state.analyzer.fetcher.clear_filter_cache():
-                                st.success("Cache cleared successfully!")
-                                st.rerun()
-                            else:
-                                st.error("Failed to clear cache")
+                        if get_analyzer().fetcher.clear_filter_cache():
+                            st.success("Cache cleared successfully!")
+                            st.rerun()
+                        else:
+                            st.error("Failed to clear cache")
 
                 if force_refresh_cache:
                     st.info("🔄 **Cache will be refreshed** - this adds ~30-60 seconds for comprehensive filtering")
@@ -302,13 +399,13 @@ def main():
             if use_smart_filtering and 'force_refresh_cache' in locals() and force_refresh_cache:
                 with st.spinner("🔄 Refreshing daily master list cache..."):
                     try:
-                        refreshed_stocks = st.session_state.analyzer.fetcher.refresh_filter_cache()
+                        refreshed_stocks = get_analyzer().fetcher.refresh_filter_cache()
                         st.success(f"✅ Cache refreshed: {len(refreshed_stocks)} stocks in master list")
                     except Exception as e:
                         st.warning(f"⚠️ Cache refresh failed: {e}")
 
             # Clear any existing cache first
-            st.cache_data.clear()
+            clear_cached_queries()
 
             # Show cloud-specific message
             if is_streamlit_cloud():
@@ -316,11 +413,22 @@ def main():
 
             # Use streaming fetch for better UX
             with st.spinner("🔄 Setting up database schema..."):
-                if not st.session_state.analyzer.setup_database():
+                if not get_analyzer().setup_database():
                     st.error("❌ Failed to setup database schema")
                 else:
                     # Stream the data fetching process with filtering option
-                    if stream_stock_data_fetch(st.session_state.analyzer, use_popular_only, max_stocks_param, use_smart_filtering):
+                    if stream_stock_data_fetch(get_analyzer(), use_popular_only, max_stocks_param, use_smart_filtering):
+                        # Invalidate results cached mid-fetch, then pre-warm the dashboard queries in parallel
+                        clear_cached_queries()
+                        sma_period = st.session_state.get('sma_period', SMA_PERIODS[0])
+                        prewarm_cached_queries([
+                            (get_cached_summary_statistics, ()),
+                            (get_cached_master_stock_count, ()),
+                            (get_cached_breakout_status_counts, (sma_period, 5.0)),
+                            (get_cached_top_breakout_opportunities, (sma_period, 5.0, 10)),
+                            (get_cached_stocks_above_sma, (sma_period,)),
+                        ])
+
                         # Force refresh of data availability check
                         check_data_availability()
                         st.success("✅ Price data fetched successfully!")
@@ -339,10 +447,10 @@ def main():
 
         if st.button("🌍 Update Master Stock List from NSE", use_container_width=True):
             with st.spinner("Fetching latest stock list from NSE and rebuilding database... This may take a moment."):
-                if st.session_state.analyzer.refresh_master_stock_list():
+                if get_analyzer().refresh_master_stock_list():
                     st.success("✅ Master stock list updated successfully!")
                     st.info("The new stock list is now available for price fetching.")
-                    st.cache_data.clear()
+                    clear_cached_queries()
                     time.sleep(2)
                     st.rerun()
                 else:
@@ -361,15 +469,29 @@ def main():
 
         # Settings
         st.subheader("⚙️ Settings")
-        sma_period = st.selectbox("SMA Period", [20, 50], index=0)
+        sma_period = st.selectbox("SMA Period", SMA_PERIODS, index=0, key="sma_period")
         auto_refresh = st.checkbox("Auto-refresh (30s)", value=False)
     
-    # Auto-refresh logic
-    if auto_refresh and st.session_state.data_fetched:
-        time.sleep(30)
-        st.rerun()
-    
-    # Main content based on selected page
+    # Auto-refresh logic: rerun only the page content on a timer instead of
+    # blocking the script thread with time.sleep()
+    run_every = "30s" if auto_refresh and st.session_state.data_fetched else None
+    st.fragment(show_selected_page, run_every=run_every)(page, sma_period, run_every is not None)
+
+def show_selected_page(page, sma_period, auto_refresh=False):
+    """
+    Render the main content for the selected page.
+
+    Each page (and each dashboard chart) is its own fragment, so moving one of
+    its widgets reruns only that section instead of every cached query.
+    While auto-refreshing, garbage is collected at most once a minute so
+    discarded figures and frames don't accumulate across timed reruns.
+    """
+    if auto_refresh:
+        now = time.monotonic()
+        if now - st.session_state.get('_last_gc', 0.0) >= GC_INTERVAL_SECONDS:
+            gc.collect()
+            st.session_state['_last_gc'] = now
+
     if page == "📊 Dashboard Overview":
         show_dashboard_overview(sma_period)
     elif page == "🎯 SMA Breakout Opportunities":
@@ -383,6 +505,7 @@ def main():
 
 # Removed old fetch function - now using streaming version
 
+@st.fragment
 def show_dashboard_overview(sma_period):
     """Show main dashboard overview."""
 
@@ -393,7 +516,7 @@ def show_dashboard_overview(sma_period):
 
     try:
         # Get summary statistics (cached)
-        stats = get_cached_summary_statistics(st.session_state.analyzer)
+        stats = get_cached_summary_statistics()
 
         if not stats or stats.get('total_stocks_with_data', 0) == 0:
             st.warning("⚠️ No stock data found. Please fetch data first.")
@@ -401,12 +524,22 @@ def show_dashboard_overview(sma_period):
     except Exception as e:
         st.error(f"❌ Error loading dashboard data: {str(e)}")
         return
+
+    # Query each dataset once per rerun and share it with the charts below
+    try:
+        breakout_counts = get_cached_breakout_status_counts(sma_period, 5.0)
+        breakout_count = int(breakout_counts['stock_count'].sum()) if breakout_counts is not None else 0
+        top_opportunities = get_cached_top_breakout_opportunities(sma_period, 5.0, 10)
+    except Exception:
+        breakout_count = 0
+        top_opportunities = None
+    extended_stocks = get_cached_stocks_above_sma(sma_period)
     
     # Metrics row
     col1, col2, col3, col4, col5 = st.columns(5)
 
     with col1:
-        master_count = get_cached_master_stock_count(st.session_state.analyzer)
+        master_count = get_cached_master_stock_count()
         st.metric(
             label="📦 Master List",
             value=master_count,
@@ -421,13 +554,6 @@ def show_dashboard_overview(sma_period):
         )
     
     with col3:
-        # Get actionable breakout opportunities
-        try:
-            breakout_opportunities = get_cached_stocks_near_sma_breakout(st.session_state.analyzer, sma_period, 5.0)
-            breakout_count = len(breakout_opportunities) if breakout_opportunities is not None else 0
-        except Exception:
-            breakout_count = 0
-
         st.metric(
             label=f"🎯 Breakout Opps",
             value=breakout_count,
@@ -461,30 +587,49 @@ def show_dashboard_overview(sma_period):
     col1, col2 = st.columns(2)
     
     with col1:
-        show_sma_distribution_chart(sma_period)
+        show_sma_distribution_chart(sma_period, stats.get('total_stocks_with_data', 0), breakout_count, extended_stocks)
     
     with col2:
-        show_top_performers_chart(sma_period)
+        show_top_performers_chart(sma_period, top_opportunities)
 
-def show_sma_distribution_chart(sma_period):
-    """Show distribution of actionable vs extended stocks."""
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def build_sma_distribution_figure(sma_period, actionable_count, extended_count, other_count):
+    """Build the trading opportunities pie chart (cached as a figure dict)."""
+    # Create pie chart with trading-focused categories
+    fig = px.pie(
+        values=[actionable_count, extended_count, other_count],
+        names=[f'🎯 Actionable (±5% of SMA)', f'📈 Extended (>5% above SMA)', f'📉 Other/Below SMA'],
+        title=f"Trading Opportunities: {sma_period}-Day SMA",
+        color_discrete_map={
+            f'🎯 Actionable (±5% of SMA)': '#f39c12',    # Orange for actionable
+            f'📈 Extended (>5% above SMA)': '#2ecc71',    # Green for extended
+            f'📉 Other/Below SMA': '#e74c3c'             # Red for below/other
+        }
+    )
+
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=400)
+    return fig.to_dict()
 
-    # Get total stocks first
-    stats = get_cached_summary_statistics(st.session_state.analyzer)
-    total = stats.get('total_stocks_with_data', 0)
+@st.fragment
+def show_sma_distribution_chart(sma_period, total, actionable_count, extended_stocks):
+    """
+    Show distribution of actionable vs extended stocks.
+
+    Args:
+        sma_period: SMA period being displayed
+        total: Number of stocks with price data
+        actionable_count: Number of stocks within ±5% of the SMA
+        extended_stocks: Stocks above SMA (DataFrame or None)
+    """
 
     if total == 0:
         st.info("No data available. Please fetch stock data first.")
         return
 
-    # Get actionable opportunities (within ±5% of SMA)
-    breakout_opportunities = get_cached_stocks_near_sma_breakout(st.session_state.analyzer, sma_period, 5.0)
-    actionable_count = len(breakout_opportunities) if breakout_opportunities is not None else 0
-
-    # Get extended stocks (>5% above SMA)
-    extended_stocks = get_cached_stocks_above_sma(st.session_state.analyzer, sma_period)
+    # Count extended stocks (>5% above SMA)
     if extended_stocks is not None:
-        extended_count = len(extended_stocks[extended_stocks['percentage_above_sma'] > 5.0])
+        extended_count = int((extended_stocks['percentage_above_sma'] > 5.0).sum())
     else:
         extended_count = 0
 
@@ -493,64 +638,47 @@ def show_sma_distribution_chart(sma_period):
 
     # Only create chart if we have data
     if actionable_count + extended_count + other_count > 0:
-        # Create pie chart with trading-focused categories
-        fig = px.pie(
-            values=[actionable_count, extended_count, other_count],
-            names=[f'🎯 Actionable (±5% of SMA)', f'📈 Extended (>5% above SMA)', f'📉 Other/Below SMA'],
-            title=f"Trading Opportunities: {sma_period}-Day SMA",
-            color_discrete_map={
-                f'🎯 Actionable (±5% of SMA)': '#f39c12',    # Orange for actionable
-                f'📈 Extended (>5% above SMA)': '#2ecc71',    # Green for extended
-                f'📉 Other/Below SMA': '#e74c3c'             # Red for below/other
-            }
-        )
-
-        fig.update_traces(textposition='inside', textinfo='percent+label')
-        fig.update_layout(height=400)
-
+        fig = build_sma_distribution_figure(sma_period, actionable_count, extended_count, other_count)
         st.plotly_chart(fig, use_container_width=True)
+        del fig
     else:
         st.info("No stock data available for chart.")
 
-def show_top_performers_chart(sma_period):
-    """Show actionable breakout opportunities."""
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def build_top_performers_figure(top_opportunities):
+    """Build the top breakout opportunities bar chart (cached as a figure dict)."""
+    fig = px.bar(
+        top_opportunities,
+        x='percentage_from_sma',
+        y='symbol',
+        orientation='h',
+        title=f"Top 10 SMA Breakout Opportunities",
+        labels={'percentage_from_sma': '% From SMA', 'symbol': 'Stock Symbol'},
+        color='breakout_status',
+        color_discrete_map=BREAKOUT_STATUS_COLORS
+    )
+
+    fig.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
+    return fig.to_dict()
 
-    try:
-        breakout_opportunities = get_cached_stocks_near_sma_breakout(st.session_state.analyzer, sma_period, 5.0)
-    except Exception:
-        breakout_opportunities = None
-
-    if breakout_opportunities is not None and not breakout_opportunities.empty:
-        # Get top 10 opportunities (closest to SMA or fresh breakouts)
-        top_opportunities = breakout_opportunities.head(10)
-
-        # Color code by breakout status
-        color_map = {
-            'Fresh Breakout Above': '#2ecc71',
-            'Fresh Breakdown Below': '#e74c3c',
-            'Holding Above': '#f39c12',
-            'Holding Below': '#ff6b6b',
-            'At SMA': '#95a5a6'
-        }
+@st.fragment
+def show_top_performers_chart(sma_period, top_opportunities):
+    """
+    Show actionable breakout opportunities.
 
-        colors = [color_map.get(status, '#95a5a6') for status in top_opportunities['breakout_status']]
-
-        fig = px.bar(
-            top_opportunities,
-            x='percentage_from_sma',
-            y='symbol',
-            orientation='h',
-            title=f"Top 10 SMA Breakout Opportunities",
-            labels={'percentage_from_sma': '% From SMA', 'symbol': 'Stock Symbol'},
-            color='breakout_status',
-            color_discrete_map=color_map
-        )
+    Args:
+        sma_period: SMA period being displayed
+        top_opportunities: Top 10 opportunities (closest to SMA or fresh breakouts)
+    """
 
-        fig.update_layout(height=400, yaxis={'categoryorder': 'total ascending'})
+    if top_opportunities is not None and not top_opportunities.empty:
+        fig = build_top_performers_figure(top_opportunities)
         st.plotly_chart(fig, use_container_width=True)
+        del fig
     else:
         st.info(f"No actionable opportunities near {sma_period}-day SMA")
 
+@st.fragment
 def show_sma_breakout_opportunities(sma_period):
     """Show stocks near SMA breakout - actionable trading opportunities."""
 
@@ -574,40 +702,50 @@ def show_sma_breakout_opportunities(sma_period):
         )
 
     # Get breakout opportunities
-    breakout_stocks = get_cached_stocks_near_sma_breakout(st.session_state.analyzer, sma_period, max_distance)
+    breakout_stocks = get_cached_stocks_near_sma_breakout(sma_period, max_distance)
 
     if breakout_stocks is None or breakout_stocks.empty:
         st.info(f"No stocks found within ±{max_distance}% of their {sma_period}-day SMA.")
         return
 
+    # Per-status counts aggregated in SQL
+    status_summary = get_cached_breakout_status_counts(sma_period, max_distance)
+    if status_summary is None:
+        status_summary = pd.DataFrame(columns=['stock_count', 'avg_distance'])
+
     # Apply breakout filter
     if breakout_filter != "All":
-        if breakout_filter == "Fresh Breakouts Only":
-            breakout_stocks = breakout_stocks[breakout_stocks['breakout_status'] == 'Fresh Breakout Above']
-        elif breakout_filter == "Fresh Breakdowns Only":
-            breakout_stocks = breakout_stocks[breakout_stocks['breakout_status'] == 'Fresh Breakdown Below']
-        elif breakout_filter == "Holding Above":
-            breakout_stocks = breakout_stocks[breakout_stocks['breakout_status'] == 'Holding Above']
-        elif breakout_filter == "Holding Below":
-            breakout_stocks = breakout_stocks[breakout_stocks['breakout_status'] == 'Holding Below']
+        filter_status = {
+            "Fresh Breakouts Only": 'Fresh Breakout Above',
+            "Fresh Breakdowns Only": 'Fresh Breakdown Below',
+            "Holding Above": 'Holding Above',
+            "Holding Below": 'Holding Below'
+        }[breakout_filter]
+        breakout_stocks = breakout_stocks[breakout_stocks['breakout_status'] == filter_status]
+        status_summary = status_summary[status_summary.index == filter_status]
+
+    status_counts = status_summary['stock_count']
+    total_opportunities = int(status_counts.sum())
 
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Opportunities", len(breakout_stocks))
+        st.metric("Total Opportunities", total_opportunities)
     with col2:
-        fresh_breakouts = len(breakout_stocks[breakout_stocks['breakout_status'] == 'Fresh Breakout Above'])
+        fresh_breakouts = int(status_counts.get('Fresh Breakout Above', 0))
         st.metric("🟢 Fresh Breakouts", fresh_breakouts)
     with col3:
-        fresh_breakdowns = len(breakout_stocks[breakout_stocks['breakout_status'] == 'Fresh Breakdown Below'])
+        fresh_breakdowns = int(status_counts.get('Fresh Breakdown Below', 0))
         st.metric("🔴 Fresh Breakdowns", fresh_breakdowns)
     with col4:
-        avg_distance = breakout_stocks['percentage_from_sma'].abs().mean()
+        if total_opportunities > 0:
+            avg_distance = (status_summary['avg_distance'] * status_counts).sum() / total_opportunities
+        else:
+            avg_distance = float('nan')
         st.metric("Avg Distance from SMA", f"{avg_distance:.1f}%")
 
     # Breakout status distribution
     st.subheader("📊 Breakout Status Distribution")
-    status_counts = breakout_stocks['breakout_status'].value_counts()
 
     fig = px.bar(
         x=status_counts.index,
@@ -619,39 +757,26 @@ def show_sma_breakout_opportunities(sma_period):
     )
     fig.update_layout(height=300)
     st.plotly_chart(fig, use_container_width=True)
+    del fig
 
     # Interactive table
     st.subheader("🎯 Actionable Opportunities")
 
-    # Format the dataframe for display
-    display_df = breakout_stocks.copy()
-    display_df['close'] = display_df['close'].round(2)
-    display_df[f'sma_{sma_period}'] = display_df[f'sma_{sma_period}'].round(2)
-    display_df['percentage_from_sma'] = display_df['percentage_from_sma'].round(2)
+    # Only format the rows the table shows; the export below still includes every row
+    display_src = breakout_stocks.head(MAX_BREAKOUT_TABLE_ROWS)
+    if len(breakout_stocks) > MAX_BREAKOUT_TABLE_ROWS:
+        st.caption(f"Showing first {MAX_BREAKOUT_TABLE_ROWS} of {len(breakout_stocks)} opportunities")
+
+    # Format the dataframe for display (single vectorized round, no extra copy)
+    display_df = display_src.round({'close': 2, f'sma_{sma_period}': 2, 'percentage_from_sma': 2})
 
     # Add status emoji
-    status_emoji_map = {
-        'Fresh Breakout Above': '🟢',
-        'Fresh Breakdown Below': '🔴',
-        'Holding Above': '🟡',
-        'Holding Below': '🟠',
-        'At SMA': '⚪'
-    }
-    display_df['status_display'] = display_df['breakout_status'].map(
-        lambda x: f"{status_emoji_map.get(x, '⚪')} {x}"
+    display_df['status_display'] = (
+        display_df['breakout_status'].map(BREAKOUT_STATUS_EMOJI).fillna('⚪') + ' ' + display_df['breakout_status']
     )
 
     # Rename columns for better display
-    column_mapping = {
-        'symbol': 'Symbol',
-        'close': 'Current Price',
-        f'sma_{sma_period}': f'{sma_period}-Day SMA',
-        'percentage_from_sma': '% From SMA',
-        'status_display': 'Breakout Status',
-        'volume': 'Volume',
-        'date': 'Date'
-    }
-    display_df = display_df.rename(columns=column_mapping)
+    display_df = display_df.rename(columns=BREAKOUT_COLUMN_MAPPINGS[sma_period])
 
     # Select columns to display
     display_columns = ['Symbol', 'Current Price', f'{sma_period}-Day SMA', '% From SMA', 'Breakout Status', 'Volume', 'Date']
@@ -676,7 +801,7 @@ def show_sma_breakout_opportunities(sma_period):
 
     # Export functionality
     if st.button("📥 Export Opportunities to CSV"):
-        csv = breakout_stocks.to_csv(index=False)
+        csv = to_csv_bytes(breakout_stocks)
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -700,6 +825,7 @@ def show_sma_breakout_opportunities(sma_period):
     if holding_above > 0:
         st.info(f"🟡 **{holding_above} Holding Above** - Stocks maintaining above {sma_period}-day SMA. Monitor for continuation.")
 
+@st.fragment
 def show_stocks_above_sma(sma_period):
     """Show detailed view of stocks above SMA."""
 
@@ -715,7 +841,7 @@ def show_stocks_above_sma(sma_period):
     with col2:
         max_results = st.selectbox("Max Results", [10, 25, 50, 100], index=1)
 
-    stocks_above_sma = get_cached_stocks_above_sma(st.session_state.analyzer, sma_period, max_distance)
+    stocks_above_sma = get_cached_stocks_above_sma(sma_period, max_distance)
 
     if stocks_above_sma is None or stocks_above_sma.empty:
         st.info(f"No stocks currently trading above their {sma_period}-day SMA within {max_distance}%.")
@@ -738,21 +864,11 @@ def show_stocks_above_sma(sma_period):
     # Filter data
     filtered_stocks = stocks_above_sma.head(max_results)
 
-    # Format the dataframe for display
-    display_df = filtered_stocks.copy()
-    display_df['close'] = display_df['close'].round(2)
-    display_df[f'sma_{sma_period}'] = display_df[f'sma_{sma_period}'].round(2)
-    display_df['percentage_above_sma'] = display_df['percentage_above_sma'].round(2)
+    # Format the dataframe for display (single vectorized round, no extra copy)
+    display_df = filtered_stocks.round({'close': 2, f'sma_{sma_period}': 2, 'percentage_above_sma': 2})
 
     # Rename columns for better display
-    column_mapping = {
-        'symbol': 'Symbol',
-        'close': 'Current Price',
-        f'sma_{sma_period}': f'{sma_period}-Day SMA',
-        'percentage_above_sma': '% Above SMA',
-        'date': 'Date'
-    }
-    display_df = display_df.rename(columns=column_mapping)
+    display_df = display_df.rename(columns=ABOVE_SMA_COLUMN_MAPPINGS[sma_period])
 
     st.dataframe(
         display_df,
@@ -771,7 +887,7 @@ def show_stocks_above_sma(sma_period):
 
     # Export functionality
     if st.button("📥 Export to CSV"):
-        csv = filtered_stocks.to_csv(index=False)
+        csv = to_csv_bytes(filtered_stocks)
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -779,6 +895,24 @@ def show_stocks_above_sma(sma_period):
             mime="text/csv"
         )
 
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def build_breakout_patterns_figure(patterns):
+    """Build the breakout patterns scatter chart (cached as a figure dict)."""
+    fig = px.scatter(
+        patterns,
+        x='symbol',
+        y='breakout_percentage',
+        size='breakout_percentage',
+        color='breakout_percentage',
+        title="Breakout Patterns by Stock",
+        labels={'breakout_percentage': 'Breakout %', 'symbol': 'Stock Symbol'},
+        color_continuous_scale='viridis'
+    )
+
+    fig.update_layout(height=400, xaxis_tickangle=-45)
+    return fig.to_dict()
+
+@st.fragment
 def show_breakout_patterns():
     """Show stocks with open=high breakout patterns."""
 
@@ -787,7 +921,7 @@ def show_breakout_patterns():
     if not ensure_data_is_fetched():
         return
 
-    patterns = get_cached_breakout_patterns(st.session_state.analyzer)
+    patterns = get_cached_breakout_patterns()
 
     if patterns is None or patterns.empty:
         st.info("No open=high breakout patterns found in current data.")
@@ -807,35 +941,22 @@ def show_breakout_patterns():
     # Interactive chart
     st.subheader("📊 Breakout Performance")
 
-    fig = px.scatter(
-        patterns,
-        x='symbol',
-        y='breakout_percentage',
-        size='breakout_percentage',
-        color='breakout_percentage',
-        title="Breakout Patterns by Stock",
-        labels={'breakout_percentage': 'Breakout %', 'symbol': 'Stock Symbol'},
-        color_continuous_scale='viridis'
-    )
-
-    fig.update_layout(height=400, xaxis_tickangle=-45)
+    fig = build_breakout_patterns_figure(patterns)
     st.plotly_chart(fig, use_container_width=True)
+    del fig
 
     # Detailed table
     st.subheader("📋 Pattern Details")
 
-    # Format the dataframe
-    display_df = patterns.copy()
+    # Format the dataframe (single vectorized round over all numeric columns)
     numeric_columns = ['yesterday_open', 'yesterday_high', 'today_close', 'breakout_percentage']
-    for col in numeric_columns:
-        if col in display_df.columns:
-            display_df[col] = display_df[col].round(2)
+    display_df = patterns.round({col: 2 for col in numeric_columns if col in patterns.columns})
 
     st.dataframe(display_df, use_container_width=True, hide_index=True)
 
     # Export functionality
     if st.button("📥 Export Patterns to CSV"):
-        csv = patterns.to_csv(index=False)
+        csv = to_csv_bytes(patterns)
         st.download_button(
             label="Download CSV",
             data=csv,
@@ -843,6 +964,36 @@ def show_breakout_patterns():
             mime="text/csv"
         )
 
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def build_price_trends_figure(price_data):
+    """
+    Build the stock price trends line chart (cached as a figure dict).
+
+    Uses WebGL (Scattergl) traces and stride-samples each symbol down to
+    MAX_TREND_POINTS_PER_SYMBOL points to keep the payload and paint time small.
+    """
+    fig = go.Figure()
+    for symbol, symbol_data in price_data.groupby('symbol', sort=False):
+        stride = -(-len(symbol_data) // MAX_TREND_POINTS_PER_SYMBOL)
+        if stride > 1:
+            symbol_data = symbol_data.iloc[::stride]
+        fig.add_trace(go.Scattergl(
+            x=symbol_data['date'],
+            y=symbol_data['close'],
+            name=symbol,
+            mode='lines'
+        ))
+
+    fig.update_layout(
+        title="Stock Price Trends",
+        xaxis_title='Date',
+        yaxis_title='Close Price',
+        legend_title_text='symbol',
+        height=400
+    )
+    return fig.to_dict()
+
+@st.fragment
 def show_data_explorer():
     """Show raw data exploration interface."""
 
@@ -852,7 +1003,7 @@ def show_data_explorer():
         return
 
     # Get latest prices (cached)
-    latest_prices = get_cached_latest_prices(st.session_state.analyzer, limit=1000)
+    latest_prices = get_cached_latest_prices(limit=1000)
 
     if latest_prices is None or latest_prices.empty:
         st.error("No price data available.")
@@ -861,49 +1012,45 @@ def show_data_explorer():
     # Data overview
     st.subheader("📊 Data Overview")
 
+    overview = get_cached_data_overview(limit=1000)
+
     col1, col2, col3, col4 = st.columns(4)
     with col1:
-        st.metric("Total Records", len(latest_prices))
+        st.metric("Total Records", overview['records'])
     with col2:
-        st.metric("Unique Stocks", latest_prices['symbol'].nunique())
+        st.metric("Unique Stocks", overview['unique_symbols'])
     with col3:
-        date_range = latest_prices['date'].nunique()
-        st.metric("Date Range (days)", date_range)
+        st.metric("Date Range (days)", overview['unique_dates'])
     with col4:
-        avg_volume = latest_prices['volume'].mean()
-        st.metric("Avg Volume", f"{avg_volume:,.0f}")
+        st.metric("Avg Volume", f"{overview['avg_volume']:,.0f}")
 
     # Stock selector
     st.subheader("🔍 Stock Data Viewer")
 
+    symbol_options = get_cached_symbol_options()
     selected_stocks = st.multiselect(
         "Select stocks to view",
-        options=sorted(latest_prices['symbol'].unique()),
-        default=sorted(latest_prices['symbol'].unique())[:5],
+        options=symbol_options,
+        default=symbol_options[:5],
         max_selections=10
     )
 
     if selected_stocks:
-        # Filter data
-        filtered_data = latest_prices[latest_prices['symbol'].isin(selected_stocks)]
+        # Fetch only the selected symbols (keyed by sorted tuple so selection order doesn't matter)
+        filtered_data = get_cached_prices_for_symbols(tuple(sorted(selected_stocks)))
+        if filtered_data is None:
+            st.info("No price data available for the selected stocks.")
+            return
 
         # Show price chart
-        fig = px.line(
-            filtered_data,
-            x='date',
-            y='close',
-            color='symbol',
-            title="Stock Price Trends",
-            labels={'close': 'Close Price', 'date': 'Date'}
-        )
-
-        fig.update_layout(height=400)
+        fig = build_price_trends_figure(filtered_data)
         st.plotly_chart(fig, use_container_width=True)
+        del fig
 
         # Show raw data
         st.subheader("📋 Raw Data")
         st.dataframe(
-            filtered_data.sort_values(['symbol', 'date']),
+            filtered_data,  # Already ordered by symbol, date in SQL
             use_container_width=True,
             hide_index=True
         )
@@ -4,11 +4,15 @@ Streamlit streaming utilities for real-time progress updates.
 
 import streamlit as st
 import time
+from datetime import datetime
 from typing import Dict, Any, Optional
 
 
 class StreamingProgressTracker:
     """Real-time progress tracker for Streamlit apps."""
+
+    # Minimum seconds between UI refreshes (each refresh is a round-trip to the browser)
+    RENDER_INTERVAL = 0.2
     
     def __init__(self, total_items: int, title: str = "Processing"):
         """
@@ -25,6 +29,9 @@ class StreamingProgressTracker:
         self.failed = 0
         self.current_batch = 0
         self.total_batches = 0
+        self._status = None
+        self._last_render_time = 0.0
+        self._rendered = {}
         
         # Create UI containers
         self.header_container = st.container()
@@ -38,7 +45,6 @@ class StreamingProgressTracker:
         
         with self.progress_container:
             self.progress_bar = st.progress(0)
-            self.progress_text = st.empty()
         
         with self.metrics_container:
             col1, col2, col3, col4 = st.columns(4)
@@ -56,7 +62,7 @@ class StreamingProgressTracker:
             self.batch_text = st.empty()
         
         self.start_time = time.time()
-        self._update_display()
+        self._update_display(force=True)
     
     def start_batch(self, batch_num: int, total_batches: int, batch_info: str = ""):
         """Start processing a new batch."""
@@ -68,7 +74,7 @@ class StreamingProgressTracker:
             batch_text += f" - {batch_info}"
         
         self.batch_text.markdown(batch_text)
-        self._update_display()
+        self._update_display(force=True)
     
     def update_progress(self, processed: int = None, successful: int = None, failed: int = None, status: str = None):
         """Update progress metrics."""
@@ -80,7 +86,7 @@ class StreamingProgressTracker:
             self.failed = failed
         
         if status:
-            self.status_text.markdown(f"📊 {status}")
+            self._status = status
         
         self._update_display()
     
@@ -93,40 +99,72 @@ class StreamingProgressTracker:
             self.failed += 1
         
         if status:
-            self.status_text.markdown(f"📊 {status}")
+            self._status = status
         
         self._update_display()
     
-    def _update_display(self):
-        """Update all display elements."""
+    def _update_display(self, force: bool = False):
+        """
+        Update all display elements.
+
+        Refreshes are throttled to one per RENDER_INTERVAL so per-item updates
+        don't each cost a browser round-trip.
+
+        Args:
+            force (bool): Render even if the last refresh was too recent
+        """
+        now = time.time()
+        if not force and self.processed < self.total_items and now - self._last_render_time < self.RENDER_INTERVAL:
+            return
+        self._last_render_time = now
+
+        if self._status:
+            self.status_text.markdown(f"📊 {self._status}")
+            self._status = None
+
         # Calculate progress percentage
         if self.total_items > 0:
             progress = min(self.processed / self.total_items, 1.0)
         else:
             progress = 0
         
-        # Update progress bar
-        self.progress_bar.progress(progress)
-        
-        # Update progress text
-        self.progress_text.markdown(f"**Progress: {self.processed}/{self.total_items} ({progress*100:.1f}%)**")
+        # Update progress bar (label included, so one element update instead of two)
+        progress_text = f"**Progress: {self.processed}/{self.total_items} ({progress*100:.1f}%)**"
+        self._render_if_changed(self.progress_bar.progress, progress, text=progress_text)
         
         # Update metrics
-        self.processed_metric.metric("📊 Processed", self.processed)
-        self.successful_metric.metric("✅ Successful", self.successful)
-        self.failed_metric.metric("❌ Failed", self.failed)
+        self._render_if_changed(self.processed_metric.metric, "📊 Processed", self.processed)
+        self._render_if_changed(self.successful_metric.metric, "✅ Successful", self.successful)
+        self._render_if_changed(self.failed_metric.metric, "❌ Failed", self.failed)
         
         # Calculate and display rate
         elapsed_time = time.time() - self.start_time
         if elapsed_time > 0 and self.processed > 0:
             rate = self.processed / elapsed_time
-            self.rate_metric.metric("⚡ Rate", f"{rate:.1f}/sec")
+            self._render_if_changed(self.rate_metric.metric, "⚡ Rate", f"{rate:.1f}/sec")
         else:
-            self.rate_metric.metric("⚡ Rate", "0.0/sec")
+            self._render_if_changed(self.rate_metric.metric, "⚡ Rate", "0.0/sec")
+
+    def _render_if_changed(self, render, *args, **kwargs):
+        """
+        Call an element's render method only if its arguments changed since the last call.
+
+        Unchanged elements (e.g. the failed count during a clean batch) then
+        send nothing to the browser.
+
+        Args:
+            render: Bound element method such as ``self.failed_metric.metric``
+        """
+        key = (id(render.__self__), render.__name__)
+        value = (args, kwargs)
+        if self._rendered.get(key) != value:
+            self._rendered[key] = value
+            render(*args, **kwargs)
     
     def complete(self, final_message: str = None):
         """Mark processing as complete."""
-        self.progress_bar.progress(1.0)
+        self._update_display(force=True)
+        self.progress_bar.progress(1.0, text=f"**Progress: {self.processed}/{self.total_items} (100.0%)**")
         
         if final_message:
             self.status_text.markdown(f"✅ **{final_message}**")
@@ -167,12 +205,7 @@ def stream_stock_data_fetch(analyzer, use_popular_only=False, max_stocks=None, u
     """
     try:
         # Get symbols to process
-        if use_popular_only:
-            symbols = analyzer.fetcher.get_stocks_from_database(use_popular_only=True, apply_filters=use_filtering)
-            if not symbols:
-                symbols = analyzer.fetcher.get_popular_nse_stocks()
-        else:
-            symbols = analyzer.fetcher.get_stocks_from_database(apply_filters=use_filtering)
+        symbols = analyzer.resolve_symbols(use_popular_only, max_stocks, apply_filters=use_filtering)
 
         # Show filtering info if enabled
         if use_filtering and hasattr(analyzer.fetcher, 'get_filtering_summary'):
@@ -188,9 +221,6 @@ def stream_stock_data_fetch(analyzer, use_popular_only=False, max_stocks=None, u
                 else:
                     st.info(f"🎯 **Smart Filtering Enabled**: Processing {len(symbols)} optimized stocks "
                            f"(cache from: {cache_date})")
-        
-        if max_stocks and len(symbols) > max_stocks:
-            symbols = symbols[:max_stocks]
 
         total_symbols = len(symbols)
 
@@ -215,10 +245,9 @@ def stream_stock_data_fetch(analyzer, use_popular_only=False, max_stocks=None, u
         batch_size = 50
         total_batches = (total_symbols + batch_size - 1) // batch_size
         
-        for batch_num in range(total_batches):
-            batch_start = batch_num * batch_size
-            batch_end = min(batch_start + batch_size, total_symbols)
-            batch_symbols = symbols[batch_start:batch_end]
+        batches = analyzer.iter_prefetched_batches(symbols, batch_size, period="3mo")
+        for batch_num, (batch_start, batch_symbols, fetch) in enumerate(batches):
+            batch_end = batch_start + len(batch_symbols)
             
             # Start batch
             tracker.start_batch(
@@ -228,28 +257,16 @@ def stream_stock_data_fetch(analyzer, use_popular_only=False, max_stocks=None, u
             )
             
             try:
-                # Fetch data for this batch
-                stock_data = analyzer.fetcher.fetch_multiple_stocks(batch_symbols, period="3mo")
+                # Fetch data for this batch (the next batch is already downloading)
+                stock_data = fetch.result()
                 
-                # Process each stock in the batch
+                # Store the whole batch at once, then report each stock
+                stored = analyzer.store_batch(stock_data)
                 for symbol in batch_symbols:
-                    if symbol in stock_data and stock_data[symbol] is not None:
-                        data = stock_data[symbol]
-                        
-                        # Store price data
-                        success = analyzer.data_manager.insert_price_data(data)
-                        
-                        if success:
-                            # Store indicators data
-                            indicators_data = data[['symbol', 'date', 'sma_20']].copy()
-                            analyzer.data_manager.insert_indicators_data(indicators_data)
-                        
-                        tracker.increment(success=success, status=f"Processed {symbol}")
+                    if stored.get(symbol, False):
+                        tracker.increment(success=True, status=f"Processed {symbol}")
                     else:
                         tracker.increment(success=False, status=f"Failed {symbol}")
-                    
-                    # Small delay to show progress
-                    time.sleep(0.01)
                 
             except Exception as e:
                 # Handle batch failure
@@ -261,12 +278,8 @@ def stream_stock_data_fetch(analyzer, use_popular_only=False, max_stocks=None, u
         
         # Update session state
         st.session_state.data_fetched = True
-        from datetime import datetime
         st.session_state.last_fetch_time = datetime.now()
         
-        # Clear caches
-        st.cache_data.clear()
-        
         # Cleanup UI
         tracker.cleanup()
         
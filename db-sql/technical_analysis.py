@@ -3,10 +3,13 @@ Technical analysis module for stock screening and pattern detection.
 This module provides functions to analyze stock data and identify trading opportunities.
 """
 
+import gc
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import List, Dict, Optional, Tuple, Iterator
 from tabulate import tabulate
 
 from stock_data_fetcher import StockDataFetcher
@@ -32,10 +35,10 @@ class TechnicalAnalyzer:
         self.fetcher = StockDataFetcher(verbose=verbose, use_filtering=use_filtering)
         self.data_manager = StockDataManager(verbose=verbose)
     
-    def _log(self, message: str):
-        """Log message if verbose mode is enabled."""
+    def _log(self, message: str, *args):
+        """Log message if verbose mode is enabled, %-formatting it with args only when printed."""
         if self.verbose:
-            print(message)
+            print(message % args if args else message)
     
     def setup_database(self) -> bool:
         """
@@ -44,6 +47,7 @@ class TechnicalAnalyzer:
         Returns:
             bool: True if successful
         """
+        self.fetcher.clear_stock_list_cache()
         return self.data_manager.setup_extended_schema()
 
     def refresh_master_stock_list(self) -> bool:
@@ -81,6 +85,7 @@ class TechnicalAnalyzer:
         success = db_manager.create_and_populate_table(cleaned_df)
 
         if success:
+            self.fetcher.clear_stock_list_cache()
             self._log(f"✓ Master stock list updated successfully with {len(cleaned_df)} stocks.")
         else:
             self._log("✗ Failed to update the master stock list in the database.")
@@ -102,27 +107,14 @@ class TechnicalAnalyzer:
         """
         try:
             if symbols is None:
-                if use_popular_only:
-                    # Use popular stocks that are known to work with yfinance
-                    symbols = self.fetcher.get_stocks_from_database(use_popular_only=True)
-                    if not symbols:
-                        # Fallback to hardcoded popular stocks
-                        symbols = self.fetcher.get_popular_nse_stocks()
-                        self._log("Using hardcoded popular stocks as fallback")
-                else:
-                    # Get ALL stocks from database
-                    symbols = self.fetcher.get_stocks_from_database()
+                symbols = self.resolve_symbols(use_popular_only, max_stocks)
 
                 if not symbols:
                     self._log("No symbols found")
                     return False
-
-            # Apply max_stocks limit if specified
-            if max_stocks and len(symbols) > max_stocks:
+            elif max_stocks and len(symbols) > max_stocks:
                 self._log(f"Limiting to first {max_stocks} stocks out of {len(symbols)}")
                 symbols = symbols[:max_stocks]
-            else:
-                self._log(f"Fetching data for all {len(symbols)} stocks from database")
 
             self._log(f"Fetching data for {len(symbols)} stocks...")
 
@@ -131,42 +123,33 @@ class TechnicalAnalyzer:
             total_records = 0
             total_processed = 0
 
-            for batch_start in range(0, len(symbols), batch_size):
-                batch_end = min(batch_start + batch_size, len(symbols))
-                batch_symbols = symbols[batch_start:batch_end]
+            for batch_start, batch_symbols, fetch in self.iter_prefetched_batches(symbols, batch_size, period):
+                batch_num = batch_start // batch_size + 1
 
-                self._log(f"Processing batch {batch_start//batch_size + 1}: symbols {batch_start+1}-{batch_end}")
+                self._log("Processing batch %d: symbols %d-%d", batch_num, batch_start + 1, batch_start + len(batch_symbols))
 
-                # Fetch data for this batch
-                stock_data = self.fetcher.fetch_multiple_stocks(batch_symbols, period)
+                # Fetch data for this batch (the next batch is already downloading)
+                stock_data = fetch.result()
 
                 if not stock_data:
-                    self._log(f"No data fetched for batch {batch_start//batch_size + 1}")
+                    self._log("No data fetched for batch %d", batch_num)
                     continue
 
                 # Store price data and indicators for this batch
-                batch_records = 0
-                for symbol, data in stock_data.items():
-                    if data is not None and not data.empty:
-                        # Store price data
-                        if self.data_manager.insert_price_data(data):
-                            batch_records += len(data)
-
-                        # Store indicators data (SMA is already calculated)
-                        indicators_data = data[['symbol', 'date', 'sma_20']].copy()
-                        self.data_manager.insert_indicators_data(indicators_data)
+                stored = self.store_batch(stock_data)
+                batch_records = sum(len(stock_data[symbol]) for symbol, success in stored.items() if success)
 
                 total_records += batch_records
                 total_processed += len(stock_data)
 
-                self._log(f"✓ Batch {batch_start//batch_size + 1} completed: {batch_records} records for {len(stock_data)} stocks")
+                self._log("✓ Batch %d completed: %d records for %d stocks", batch_num, batch_records, len(stock_data))
 
                 # Clear batch data from memory
                 del stock_data
 
-                # Small pause between batches to allow garbage collection
-                import time
-                time.sleep(0.5)
+                # Periodically reclaim memory on large runs instead of idling between batches
+                if batch_num % 10 == 0:
+                    gc.collect()
 
             self._log(f"✓ Successfully stored {total_records} price records for {total_processed} stocks")
             return True
@@ -175,6 +158,102 @@ class TechnicalAnalyzer:
             self._log(f"Error fetching and storing data: {e}")
             return False
     
+    def resolve_symbols(self, use_popular_only: bool = False, max_stocks: int = None,
+                        apply_filters: bool = None) -> List[str]:
+        """
+        Resolve the symbols to fetch from the master list.
+
+        Args:
+            use_popular_only (bool): If True, use only popular stocks that work well with yfinance
+            max_stocks (int, optional): Maximum number of stocks to return. If None, returns all
+            apply_filters (bool, optional): Whether to apply stock filtering. If None, uses the fetcher setting
+
+        Returns:
+            List[str]: Symbols to fetch (empty if none were found)
+        """
+        if use_popular_only:
+            # Use popular stocks that are known to work with yfinance
+            symbols = self.fetcher.get_stocks_from_database(use_popular_only=True, apply_filters=apply_filters)
+            if not symbols:
+                # Fallback to hardcoded popular stocks
+                symbols = self.fetcher.get_popular_nse_stocks()
+                self._log("Using hardcoded popular stocks as fallback")
+        else:
+            # Get ALL stocks from database
+            symbols = self.fetcher.get_stocks_from_database(apply_filters=apply_filters)
+
+        if not symbols:
+            return []
+
+        # Apply max_stocks limit if specified
+        if max_stocks and len(symbols) > max_stocks:
+            self._log(f"Limiting to first {max_stocks} stocks out of {len(symbols)}")
+            return symbols[:max_stocks]
+
+        self._log(f"Fetching data for all {len(symbols)} stocks from database")
+        return list(symbols)
+
+    def iter_prefetched_batches(self, symbols: List[str], batch_size: int,
+                                period: str = "3mo") -> Iterator[Tuple[int, List[str], Future]]:
+        """
+        Split symbols into batches and fetch them one batch ahead of the caller.
+
+        While the caller stores batch N, batch N+1 is already downloading on a
+        background thread, hiding network latency behind database writes.
+        Only one fetch runs at a time.
+
+        Args:
+            symbols (List[str]): Symbols to fetch
+            batch_size (int): Symbols per batch
+            period (str): Period for data fetching
+
+        Yields:
+            Tuple[int, List[str], Future]: Batch start index, batch symbols, and a future
+            resolving to the fetch_multiple_stocks() result (call .result() to get it)
+        """
+        batches = [(start, symbols[start:start + batch_size]) for start in range(0, len(symbols), batch_size)]
+        if not batches:
+            return
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = executor.submit(self.fetcher.fetch_multiple_stocks, batches[0][1], period)
+            for index, (batch_start, batch_symbols) in enumerate(batches):
+                current = pending
+                if index + 1 < len(batches):
+                    pending = executor.submit(self.fetcher.fetch_multiple_stocks, batches[index + 1][1], period)
+                yield batch_start, batch_symbols, current
+
+    def store_batch(self, stock_data: Dict[str, pd.DataFrame]) -> Dict[str, bool]:
+        """
+        Store a fetched batch with a single price upsert and a single indicators upsert.
+
+        Falls back to per-symbol inserts if the bulk upsert fails, so one bad
+        frame doesn't lose the whole batch.
+
+        Args:
+            stock_data (Dict[str, pd.DataFrame]): Symbol -> OHLCV data (with sma_20) from the fetcher
+
+        Returns:
+            Dict[str, bool]: Whether each symbol's price data was stored
+        """
+        frames = {symbol: data for symbol, data in stock_data.items() if data is not None and not data.empty}
+        if not frames:
+            return {}
+
+        batch = pd.concat(frames.values(), ignore_index=True)
+        if self.data_manager.insert_price_data(batch):
+            # Store indicators data (SMA is already calculated)
+            self.data_manager.insert_indicators_data(batch[['symbol', 'date', 'sma_20']])
+            return {symbol: True for symbol in frames}
+
+        self._log("Bulk insert failed, retrying symbols individually")
+        results = {}
+        for symbol, data in frames.items():
+            results[symbol] = self.data_manager.insert_price_data(data)
+            if results[symbol]:
+                self.data_manager.insert_indicators_data(data[['symbol', 'date', 'sma_20']])
+        return results
+
     def get_stocks_near_sma_breakout(self, sma_period: int = 20, max_distance: float = 5.0) -> Optional[pd.DataFrame]:
         """
         Get stocks near SMA that are breaking out (actionable opportunities).
@@ -188,6 +267,34 @@ class TechnicalAnalyzer:
         """
         return self.data_manager.get_stocks_near_sma_breakout(sma_period, max_distance)
 
+    def get_top_breakout_opportunities(self, sma_period: int = 20, max_distance: float = 5.0,
+                                       limit: Optional[int] = 10) -> Optional[pd.DataFrame]:
+        """
+        Get the top-ranked stocks near SMA breakout.
+
+        Args:
+            sma_period (int): SMA period
+            max_distance (float): Maximum percentage distance from SMA
+            limit (Optional[int]): Maximum rows to return
+
+        Returns:
+            Optional[pd.DataFrame]: Top breakout opportunities or None
+        """
+        return self.data_manager.get_top_breakout_opportunities(sma_period, max_distance, limit)
+
+    def get_breakout_status_counts(self, sma_period: int = 20, max_distance: float = 5.0) -> Optional[pd.DataFrame]:
+        """
+        Get the number of stocks near SMA per breakout status.
+
+        Args:
+            sma_period (int): SMA period
+            max_distance (float): Maximum percentage distance from SMA
+
+        Returns:
+            Optional[pd.DataFrame]: Per-status counts or None
+        """
+        return self.data_manager.get_breakout_status_counts(sma_period, max_distance)
+
     def get_stocks_above_sma(self, sma_period: int = 20, max_distance: float = None) -> Optional[pd.DataFrame]:
         """
         Get stocks currently trading above their SMA.
@@ -227,23 +334,28 @@ class TechnicalAnalyzer:
             print("Try running 'Fetch Latest Data' first.")
             return
 
-        # Format the data for display
-        display_data = []
-        for _, row in stocks.iterrows():
-            # Color coding for breakout status
-            status_symbol = "🟢" if "Above" in row['breakout_status'] else "🔴" if "Below" in row['breakout_status'] else "⚪"
-
-            display_data.append([
-                row['symbol'],
-                f"{row['close']:.2f}",
-                f"{row[f'sma_{sma_period}']:.2f}",
-                f"{row['percentage_from_sma']:+.2f}%",
-                f"{status_symbol} {row['breakout_status']}",
-                row['date']
-            ])
+        # Format the data for display (column-wise instead of per-row iterrows)
+        status = stocks['breakout_status']
+
+        # Color coding for breakout status
+        status_symbol = pd.Series(
+            np.select([status.str.contains("Above", na=False), status.str.contains("Below", na=False)], ["🟢", "🔴"], default="⚪"),
+            index=stocks.index
+        )
+
+        display_data = pd.DataFrame({
+            'symbol': stocks['symbol'],
+            'close': stocks['close'].map('{:.2f}'.format),
+            'sma': stocks[f'sma_{sma_period}'].map('{:.2f}'.format),
+            'percentage': stocks['percentage_from_sma'].map('{:+.2f}%'.format),
+            'status': status_symbol + " " + status,
+            'date': stocks['date']
+        })
 
         headers = ['Symbol', 'Current Price', f'{sma_period}-Day SMA', '% From SMA', 'Breakout Status', 'Date']
-        print(tabulate(display_data, headers=headers, tablefmt="grid"))
+        # Plain pandas formatting for the bulk tables; grid borders are kept for the small summary
+        display_data.columns = headers
+        print(display_data.to_string(index=False))
         print(f"\nTotal actionable stocks near {sma_period}-day SMA: {len(display_data)}")
 
         # Show breakdown by status
@@ -273,19 +385,18 @@ class TechnicalAnalyzer:
             print("Try running 'Fetch Latest Data' first.")
             return
 
-        # Format the data for display
-        display_data = []
-        for _, row in stocks.iterrows():
-            display_data.append([
-                row['symbol'],
-                f"{row['close']:.2f}",
-                f"{row[f'sma_{sma_period}']:.2f}",
-                f"{row['percentage_above_sma']:.2f}%",
-                row['date']
-            ])
+        # Format the data for display (column-wise instead of per-row iterrows)
+        display_data = pd.DataFrame({
+            'symbol': stocks['symbol'],
+            'close': stocks['close'].map('{:.2f}'.format),
+            'sma': stocks[f'sma_{sma_period}'].map('{:.2f}'.format),
+            'percentage': stocks['percentage_above_sma'].map('{:.2f}%'.format),
+            'date': stocks['date']
+        })
 
         headers = ['Symbol', 'Current Price', f'{sma_period}-Day SMA', '% Above SMA', 'Date']
-        print(tabulate(display_data, headers=headers, tablefmt="grid"))
+        display_data.columns = headers
+        print(display_data.to_string(index=False))
         print(f"\nTotal stocks above {sma_period}-day SMA: {len(display_data)}")
     
     def display_open_high_patterns(self):
@@ -299,18 +410,16 @@ class TechnicalAnalyzer:
             print("Try running 'Fetch Latest Data' first.")
             return
         
-        # Format the data for display
-        display_data = []
-        for _, row in patterns.iterrows():
-            display_data.append([
-                row['symbol'],
-                row['yesterday_date'],
-                f"{row['yesterday_open']:.2f}",
-                f"{row['yesterday_high']:.2f}",
-                row['today_date'],
-                f"{row['today_close']:.2f}",
-                f"{row['breakout_percentage']:.2f}%"
-            ])
+        # Format the data for display (column-wise instead of per-row iterrows)
+        display_data = pd.DataFrame({
+            'symbol': patterns['symbol'],
+            'yesterday_date': patterns['yesterday_date'],
+            'yesterday_open': patterns['yesterday_open'].map('{:.2f}'.format),
+            'yesterday_high': patterns['yesterday_high'].map('{:.2f}'.format),
+            'today_date': patterns['today_date'],
+            'today_close': patterns['today_close'].map('{:.2f}'.format),
+            'breakout_percentage': patterns['breakout_percentage'].map('{:.2f}%'.format)
+        })
         
         headers = [
             'Symbol', 
@@ -321,7 +430,8 @@ class TechnicalAnalyzer:
             'Today Close',
             'Breakout %'
         ]
-        print(tabulate(display_data, headers=headers, tablefmt="grid"))
+        display_data.columns = headers
+        print(display_data.to_string(index=False))
         print(f"\nTotal stocks with open=high patterns: {len(display_data)}")
     
     def get_summary_statistics(self) -> Dict[str, int]:
@@ -331,29 +441,9 @@ class TechnicalAnalyzer:
         Returns:
             Dict[str, int]: Summary statistics
         """
-        try:
-            stats = {}
-            
-            # Count stocks above SMA
-            stocks_above_sma = self.get_stocks_above_sma(20)
-            stats['stocks_above_20_sma'] = len(stocks_above_sma) if stocks_above_sma is not None else 0
-            
-            # Count open=high patterns
-            open_high_patterns = self.get_open_high_patterns()
-            stats['open_high_patterns'] = len(open_high_patterns) if open_high_patterns is not None else 0
-            
-            # Count total stocks with data
-            latest_prices = self.data_manager.get_latest_prices(limit=10000)
-            if latest_prices is not None:
-                stats['total_stocks_with_data'] = latest_prices['symbol'].nunique()
-            else:
-                stats['total_stocks_with_data'] = 0
-            
-            return stats
-            
-        except Exception as e:
-            self._log(f"Error getting summary statistics: {e}")
-            return {}
+        # Stocks above SMA, open=high patterns and stocks with data come back from one query
+        stats = self.data_manager.get_summary_counts(20)
+        return stats if stats is not None else {}
     
     def display_summary(self):
         """Display summary statistics."""
@@ -406,24 +496,24 @@ class TechnicalAnalyzer:
             bool: True if successful
         """
         try:
-            from pathlib import Path
             output_path = Path(output_dir)
             
-            # Export stocks above SMA
-            stocks_above_sma = self.get_stocks_above_sma(20)
-            if stocks_above_sma is not None and not stocks_above_sma.empty:
-                sma_file = output_path / "stocks_above_20_sma.csv"
-                stocks_above_sma.to_csv(sma_file, index=False)
+            sma_file = output_path / "stocks_above_20_sma.csv"
+            patterns_file = output_path / "open_high_patterns.csv"
+
+            # Both exports stream from their own database connection, so run them side by side
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                sma_export = executor.submit(self.data_manager.export_stocks_above_sma_to_csv, sma_file, 20)
+                patterns_export = executor.submit(self.data_manager.export_open_high_patterns_to_csv, patterns_file)
+                sma_rows = sma_export.result()
+                pattern_rows = patterns_export.result()
+
+            if sma_rows:
                 self._log(f"Exported stocks above SMA to {sma_file}")
-            
-            # Export open=high patterns
-            open_high_patterns = self.get_open_high_patterns()
-            if open_high_patterns is not None and not open_high_patterns.empty:
-                patterns_file = output_path / "open_high_patterns.csv"
-                open_high_patterns.to_csv(patterns_file, index=False)
+            if pattern_rows:
                 self._log(f"Exported open=high patterns to {patterns_file}")
             
-            return True
+            return sma_rows is not None and pattern_rows is not None
             
         except Exception as e:
             self._log(f"Error exporting results: {e}")
@@ -3,8 +3,9 @@
 Test script to demonstrate the new actionable trading opportunities focus.
 """
 
+import numpy as np
+
 from technical_analysis import TechnicalAnalyzer
-from datetime import datetime
 
 
 def test_actionable_opportunities():
@@ -28,22 +29,23 @@ def test_actionable_opportunities():
     if all_above_sma is not None:
         print(f"Total stocks above 20-day SMA: {len(all_above_sma)}")
         
-        # Show distribution
-        extended_stocks = all_above_sma[all_above_sma['percentage_above_sma'] > 8.0]
-        moderate_stocks = all_above_sma[
-            (all_above_sma['percentage_above_sma'] > 3.0) & 
-            (all_above_sma['percentage_above_sma'] <= 8.0)
-        ]
-        fresh_stocks = all_above_sma[all_above_sma['percentage_above_sma'] <= 3.0]
+        # Show distribution: rows come back ordered by percentage_above_sma, so the
+        # ≤3% / 3-8% / >8% bands are contiguous slices split at two boundaries
+        pct_above = all_above_sma['percentage_above_sma'].to_numpy()
+        i3, i8 = np.searchsorted(pct_above, [3.0, 8.0], side='right')
+        fresh_count, moderate_count, extended_count = i3, i8 - i3, len(pct_above) - i8
         
-        print(f"• Extended (>8% above): {len(extended_stocks)} stocks - TOO LATE TO ENTER")
-        print(f"• Moderate (3-8% above): {len(moderate_stocks)} stocks - RISKY ENTRY")
-        print(f"• Fresh (≤3% above): {len(fresh_stocks)} stocks - POTENTIAL ENTRY")
+        print(f"• Extended (>8% above): {extended_count} stocks - TOO LATE TO ENTER")
+        print(f"• Moderate (3-8% above): {moderate_count} stocks - RISKY ENTRY")
+        print(f"• Fresh (≤3% above): {fresh_count} stocks - POTENTIAL ENTRY")
         
-        if len(extended_stocks) > 0:
+        if extended_count > 0:
             print(f"\nExtended stocks (avoid these):")
-            for _, stock in extended_stocks.head(5).iterrows():
-                print(f"  {stock['symbol']}: {stock['percentage_above_sma']:.1f}% above SMA")
+            extended_stocks = all_above_sma.iloc[i8:i8 + 5]
+            print("\n".join(
+                f"  {symbol}: {pct:.1f}% above SMA"
+                for symbol, pct in extended_stocks[['symbol', 'percentage_above_sma']].itertuples(index=False, name=None)
+            ))
     
     print("\n2. NEW ACTIONABLE APPROACH (Near SMA breakouts)")
     print("-" * 50)
@@ -53,32 +55,34 @@ def test_actionable_opportunities():
     if actionable_opportunities is not None:
         print(f"Total actionable opportunities: {len(actionable_opportunities)}")
         
-        # Breakdown by status
+        # Breakdown by status (counts and the near-SMA mask are reused in section 4)
+        symbols = actionable_opportunities['symbol'].to_numpy()
+        pct_from_sma = actionable_opportunities['percentage_from_sma'].to_numpy()
         status_counts = actionable_opportunities['breakout_status'].value_counts()
+        near_sma_mask = np.abs(pct_from_sma) <= 2.0
         print(f"\nBreakdown by status:")
-        for status, count in status_counts.items():
-            emoji = "🟢" if "Above" in status else "🔴" if "Below" in status else "⚪"
-            print(f"  {emoji} {status}: {count} stocks")
+        print("\n".join(
+            f"  {'🟢' if 'Above' in status else '🔴' if 'Below' in status else '⚪'} {status}: {count} stocks"
+            for status, count in status_counts.items()
+        ))
         
         # Show fresh breakouts (best opportunities)
-        fresh_breakouts = actionable_opportunities[
-            actionable_opportunities['breakout_status'] == 'Fresh Breakout Above'
-        ]
-        
-        if len(fresh_breakouts) > 0:
+        if status_counts.get('Fresh Breakout Above', 0) > 0:
+            fresh_idx = np.flatnonzero(actionable_opportunities['breakout_status'].to_numpy() == 'Fresh Breakout Above')[:5]
             print(f"\n🎯 FRESH BREAKOUTS (Best opportunities):")
-            for _, stock in fresh_breakouts.head(5).iterrows():
-                print(f"  {stock['symbol']}: {stock['percentage_from_sma']:+.1f}% from SMA - FRESH BREAKOUT!")
+            print("\n".join(
+                f"  {symbol}: {pct:+.1f}% from SMA - FRESH BREAKOUT!"
+                for symbol, pct in zip(symbols[fresh_idx], pct_from_sma[fresh_idx])
+            ))
         
         # Show stocks near SMA (setup opportunities)
-        near_sma = actionable_opportunities[
-            actionable_opportunities['percentage_from_sma'].abs() <= 2.0
-        ]
-        
-        if len(near_sma) > 0:
+        if near_sma_mask.any():
+            near_idx = np.flatnonzero(near_sma_mask)[:5]
             print(f"\n⚪ NEAR SMA (Setup opportunities):")
-            for _, stock in near_sma.head(5).iterrows():
-                print(f"  {stock['symbol']}: {stock['percentage_from_sma']:+.1f}% from SMA - WATCH FOR BREAKOUT")
+            print("\n".join(
+                f"  {symbol}: {pct:+.1f}% from SMA - WATCH FOR BREAKOUT"
+                for symbol, pct in zip(symbols[near_idx], pct_from_sma[near_idx])
+            ))
     
     print("\n3. TRADING STRATEGY COMPARISON")
     print("-" * 50)
@@ -99,17 +103,9 @@ def test_actionable_opportunities():
     print("-" * 50)
     
     if actionable_opportunities is not None:
-        fresh_breakouts = len(actionable_opportunities[
-            actionable_opportunities['breakout_status'] == 'Fresh Breakout Above'
-        ])
-        
-        holding_above = len(actionable_opportunities[
-            actionable_opportunities['breakout_status'] == 'Holding Above'
-        ])
-        
-        near_sma_count = len(actionable_opportunities[
-            actionable_opportunities['percentage_from_sma'].abs() <= 2.0
-        ])
+        fresh_breakouts = status_counts.get('Fresh Breakout Above', 0)
+        holding_above = status_counts.get('Holding Above', 0)
+        near_sma_count = int(near_sma_mask.sum())
         
         print(f"🟢 Fresh Breakouts: {fresh_breakouts} stocks")
         print("   → BUY signal - stocks breaking above SMA today")
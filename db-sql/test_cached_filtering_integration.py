@@ -8,7 +8,29 @@ from technical_analysis import TechnicalAnalyzer
 from stock_data_fetcher import StockDataFetcher
 from stock_filter_cache import CachedStockFilter
 import time
+import timeit
 import os
+import json
+from pathlib import Path
+
+# Keys every filter cache file must contain
+REQUIRED_CACHE_KEYS = frozenset({'date', 'timestamp', 'symbols', 'count', 'filter_criteria'})
+
+# Analyzers shared between tests, keyed by (verbose, use_filtering)
+_analyzers = {}
+
+def _get_analyzer(verbose: bool, use_filtering: bool) -> TechnicalAnalyzer:
+    """Return the shared analyzer for this configuration, creating it on first use."""
+    key = (verbose, use_filtering)
+    if key not in _analyzers:
+        _analyzers[key] = TechnicalAnalyzer(verbose=verbose, use_filtering=use_filtering)
+    return _analyzers[key]
+
+def _time_runs(fetch, runs: int = 3):
+    """Time repeated calls with timeit (perf_counter, GC paused); returns (times, last result)."""
+    results = []
+    times = timeit.repeat(lambda: results.append(fetch()), number=1, repeat=runs)
+    return times, results[-1]
 
 def test_cached_filtering_workflow():
     """Test the complete cached filtering workflow."""
@@ -23,7 +45,7 @@ def test_cached_filtering_workflow():
     
     # Test 1: TechnicalAnalyzer with cached filtering
     print("\n1. Testing TechnicalAnalyzer with CACHED FILTERING:")
-    analyzer = TechnicalAnalyzer(verbose=True, use_filtering=True)
+    analyzer = _get_analyzer(verbose=True, use_filtering=True)
     
     print(f"   Analyzer filtering enabled: {analyzer.use_filtering}")
     print(f"   Fetcher filtering enabled: {analyzer.fetcher.use_filtering}")
@@ -31,9 +53,9 @@ def test_cached_filtering_workflow():
     
     # Test 2: First fetch (should create cache)
     print("\n2. First stock fetch (should CREATE cache):")
-    start_time = time.time()
+    start_time = time.perf_counter()
     stocks_first = analyzer.fetcher.get_stocks_from_database()
-    first_time = time.time() - start_time
+    first_time = time.perf_counter() - start_time
     
     print(f"   First fetch: {len(stocks_first)} stocks in {first_time:.3f}s")
     
@@ -45,22 +67,25 @@ def test_cached_filtering_workflow():
     
     # Test 3: Second fetch (should use cache)
     print("\n3. Second stock fetch (should USE cache):")
-    start_time = time.time()
+    start_time = time.perf_counter()
     stocks_second = analyzer.fetcher.get_stocks_from_database()
-    second_time = time.time() - start_time
+    # A cache hit can be faster than the clock's resolution; keep the speedup ratio finite
+    second_time = max(time.perf_counter() - start_time, 1e-6)
     
     print(f"   Second fetch: {len(stocks_second)} stocks in {second_time:.3f}s")
     print(f"   Speed improvement: {first_time/second_time:.1f}x faster")
-    print(f"   Results consistent: {stocks_first == stocks_second}")
+    # Compare as sets: the same symbols in a different order is still a consistent result
+    first_symbols = frozenset(stocks_first)
+    print(f"   Results consistent: {len(stocks_second) == len(stocks_first) and frozenset(stocks_second) == first_symbols}")
     
     # Test 4: Cache refresh
     print("\n4. Testing CACHE REFRESH:")
-    start_time = time.time()
+    start_time = time.perf_counter()
     refreshed_stocks = analyzer.fetcher.refresh_filter_cache()
-    refresh_time = time.time() - start_time
+    refresh_time = time.perf_counter() - start_time
     
     print(f"   Cache refresh: {len(refreshed_stocks)} stocks in {refresh_time:.3f}s")
-    print(f"   Results consistent: {stocks_first == refreshed_stocks}")
+    print(f"   Results consistent: {len(refreshed_stocks) == len(stocks_first) and frozenset(refreshed_stocks) == first_symbols}")
     
     # Test 5: Filtering summary
     print("\n5. Testing FILTERING SUMMARY:")
@@ -85,7 +110,7 @@ def test_cache_persistence():
     print("CACHE PERSISTENCE TEST")
     print("=" * 60)
     
-    # Test 1: Create new analyzer instance
+    # Test 1: Create new analyzer instance (deliberately not shared, to prove the on-disk cache is reused)
     print("\n1. Creating NEW analyzer instance:")
     analyzer_new = TechnicalAnalyzer(verbose=True, use_filtering=True)
     
@@ -96,9 +121,9 @@ def test_cache_persistence():
     
     # Test 2: Fetch using existing cache
     print("\n2. Fetching with existing cache:")
-    start_time = time.time()
+    start_time = time.perf_counter()
     stocks_cached = analyzer_new.fetcher.get_stocks_from_database()
-    cached_time = time.time() - start_time
+    cached_time = time.perf_counter() - start_time
     
     print(f"   Cached fetch: {len(stocks_cached)} stocks in {cached_time:.3f}s")
     
@@ -108,12 +133,12 @@ def test_cache_persistence():
     print(f"   Cache cleared: {clear_success}")
     
     # Fetch after cache clear (should recreate)
-    start_time = time.time()
+    start_time = time.perf_counter()
     stocks_recreated = analyzer_new.fetcher.get_stocks_from_database()
-    recreate_time = time.time() - start_time
+    recreate_time = time.perf_counter() - start_time
     
     print(f"   Recreated fetch: {len(stocks_recreated)} stocks in {recreate_time:.3f}s")
-    print(f"   Results consistent: {stocks_cached == stocks_recreated}")
+    print(f"   Results consistent: {len(stocks_recreated) == len(stocks_cached) and frozenset(stocks_recreated) == frozenset(stocks_cached)}")
     
     return {
         'cached_time': cached_time,
@@ -129,40 +154,38 @@ def test_performance_comparison():
     
     # Test with caching enabled
     print("\n1. Testing WITH caching:")
-    analyzer_cached = TechnicalAnalyzer(verbose=False, use_filtering=True)
-    
-    times_cached = []
-    for i in range(3):
-        start_time = time.time()
-        stocks = analyzer_cached.fetcher.get_stocks_from_database()
-        elapsed = time.time() - start_time
-        times_cached.append(elapsed)
+    analyzer_cached = _get_analyzer(verbose=False, use_filtering=True)
+    
+    times_cached, stocks = _time_runs(analyzer_cached.fetcher.get_stocks_from_database)
+    for i, elapsed in enumerate(times_cached):
         print(f"   Run {i+1}: {len(stocks)} stocks in {elapsed:.3f}s")
     
     # Test without caching
     print("\n2. Testing WITHOUT caching:")
-    analyzer_no_cache = TechnicalAnalyzer(verbose=False, use_filtering=False)
-    
-    times_no_cache = []
-    for i in range(3):
-        start_time = time.time()
-        stocks = analyzer_no_cache.fetcher.get_stocks_from_database()
-        elapsed = time.time() - start_time
-        times_no_cache.append(elapsed)
+    analyzer_no_cache = _get_analyzer(verbose=False, use_filtering=False)
+    
+    times_no_cache, stocks = _time_runs(analyzer_no_cache.fetcher.get_stocks_from_database)
+    for i, elapsed in enumerate(times_no_cache):
         print(f"   Run {i+1}: {len(stocks)} stocks in {elapsed:.3f}s")
     
-    # Calculate averages
+    # Calculate averages (run 1 is cold; the best later run is the steady-state cost)
     avg_cached = sum(times_cached) / len(times_cached)
     avg_no_cache = sum(times_no_cache) / len(times_no_cache)
+    warm_cached = min(times_cached[1:])
+    warm_no_cache = min(times_no_cache[1:])
     
     print(f"\n3. PERFORMANCE RESULTS:")
-    print(f"   Average with caching: {avg_cached:.3f}s")
-    print(f"   Average without caching: {avg_no_cache:.3f}s")
+    print(f"   Average with caching: {avg_cached:.3f}s (cold {times_cached[0]:.3f}s, warm {warm_cached:.3f}s)")
+    print(f"   Average without caching: {avg_no_cache:.3f}s (cold {times_no_cache[0]:.3f}s, warm {warm_no_cache:.3f}s)")
     print(f"   Performance difference: {abs(avg_cached - avg_no_cache):.3f}s")
     
     return {
         'avg_cached': avg_cached,
         'avg_no_cache': avg_no_cache,
+        'cold_cached': times_cached[0],
+        'warm_cached': warm_cached,
+        'cold_no_cache': times_no_cache[0],
+        'warm_no_cache': warm_no_cache,
         'performance_gain': abs(avg_cached - avg_no_cache)
     }
 
@@ -173,15 +196,14 @@ def test_cache_file_structure():
     print("=" * 60)
     
     # Create cache
-    analyzer = TechnicalAnalyzer(verbose=True, use_filtering=True)
+    analyzer = _get_analyzer(verbose=True, use_filtering=True)
     stocks = analyzer.fetcher.get_stocks_from_database()
     
     # Check cache file
     cache_file = "stock_filter_cache.json"
     if os.path.exists(cache_file):
-        import json
-        with open(cache_file, 'r') as f:
-            cache_data = json.load(f)
+        # One binary read handed straight to the C decoder, as StockFilterCache does
+        cache_data = json.loads(Path(cache_file).read_bytes())
         
         print(f"Cache file structure:")
         for key, value in cache_data.items():
@@ -191,11 +213,10 @@ def test_cache_file_structure():
                 print(f"   {key}: {value}")
         
         # Validate structure
-        required_keys = ['date', 'timestamp', 'symbols', 'count', 'filter_criteria']
-        missing_keys = [key for key in required_keys if key not in cache_data]
+        missing_keys = REQUIRED_CACHE_KEYS.difference(cache_data)
         
         if missing_keys:
-            print(f"   ❌ Missing keys: {missing_keys}")
+            print(f"   ❌ Missing keys: {sorted(missing_keys)}")
         else:
             print(f"   ✅ All required keys present")
         
@@ -235,8 +256,10 @@ if __name__ == "__main__":
     print(f"   • Cache recreation: {persistence_results['recreate_time']:.3f}s")
     
     print(f"\n✅ Performance Comparison:")
-    print(f"   • With caching: {performance_results['avg_cached']:.3f}s")
-    print(f"   • Without caching: {performance_results['avg_no_cache']:.3f}s")
+    print(f"   • With caching: {performance_results['avg_cached']:.3f}s "
+          f"(cold {performance_results['cold_cached']:.3f}s, warm {performance_results['warm_cached']:.3f}s)")
+    print(f"   • Without caching: {performance_results['avg_no_cache']:.3f}s "
+          f"(cold {performance_results['cold_no_cache']:.3f}s, warm {performance_results['warm_no_cache']:.3f}s)")
     print(f"   • Performance difference: {performance_results['performance_gain']:.3f}s")
     
     print(f"\n✅ Cache Structure:")
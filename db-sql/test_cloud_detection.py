@@ -5,7 +5,6 @@ Test script to verify cloud detection and database path handling.
 
 import os
 import tempfile
-from pathlib import Path
 
 def test_cloud_detection():
     """Test cloud environment detection."""
@@ -13,14 +12,16 @@ def test_cloud_detection():
     print("TESTING CLOUD ENVIRONMENT DETECTION")
     print("=" * 60)
     
-    # Check current environment
+    # Check current environment (each variable is read once)
+    sharing_mode = os.environ.get('STREAMLIT_SHARING_MODE')
+    streamlit_cloud = os.environ.get('STREAMLIT_CLOUD')
     print("Current Environment:")
-    print(f"  STREAMLIT_SHARING_MODE: {os.getenv('STREAMLIT_SHARING_MODE', 'Not set')}")
-    print(f"  STREAMLIT_CLOUD: {os.getenv('STREAMLIT_CLOUD', 'Not set')}")
+    print(f"  STREAMLIT_SHARING_MODE: {'Not set' if sharing_mode is None else sharing_mode}")
+    print(f"  STREAMLIT_CLOUD: {'Not set' if streamlit_cloud is None else streamlit_cloud}")
     
     # Test cloud detection function
     def is_streamlit_cloud():
-        return bool(os.getenv('STREAMLIT_SHARING_MODE') or os.getenv('STREAMLIT_CLOUD'))
+        return bool(sharing_mode or streamlit_cloud)
     
     is_cloud = is_streamlit_cloud()
     print(f"  Detected as cloud: {is_cloud}")
@@ -34,7 +35,7 @@ def test_cloud_detection():
         db_path = "tradable_stocks.db"
         print(f"  Local path: {db_path}")
     
-    print(f"  Resolved path: {Path(db_path).absolute()}")
+    print(f"  Resolved path: {os.path.abspath(db_path)}")
     print(f"  Temp directory: {tempfile.gettempdir()}")
     
     # Test config import
@@ -42,7 +43,7 @@ def test_cloud_detection():
     try:
         from config import DB_FILE
         print(f"  Config DB_FILE: {DB_FILE}")
-        print(f"  Config path exists: {Path(DB_FILE).exists()}")
+        print(f"  Config path exists: {os.path.exists(DB_FILE)}")
     except Exception as e:
         print(f"  Config import error: {e}")
     
@@ -52,7 +53,7 @@ def test_cloud_detection():
         from database_manager import DatabaseManager
         db_manager = DatabaseManager(verbose=True)
         print(f"  Database file: {db_manager.db_file}")
-        print(f"  File exists: {Path(db_manager.db_file).exists()}")
+        print(f"  File exists: {os.path.exists(db_manager.db_file)}")
         
         # Test connection
         with db_manager.get_connection() as conn:
@@ -6,6 +6,7 @@ Comprehensive test of the complete stock filtering system integration.
 from technical_analysis import TechnicalAnalyzer
 from stock_data_fetcher import StockDataFetcher
 from stock_filter import StockFilter
+from statistics import median
 import time
 
 def test_complete_integration():
@@ -36,20 +37,20 @@ def test_complete_integration():
     # Test 3: Compare stock counts
     print("\n3. Comparing STOCK COUNTS:")
     
-    # Get stocks with filtering
-    start_time = time.time()
-    filtered_stocks = analyzer_filtered.fetcher.get_stocks_from_database()
-    filtered_time = time.time() - start_time
+    # Count stocks with filtering
+    start_time = time.perf_counter()
+    filtered_count = analyzer_filtered.fetcher.count_stocks()
+    filtered_time = time.perf_counter() - start_time
     
-    # Get stocks without filtering
-    start_time = time.time()
-    all_stocks = analyzer_no_filter.fetcher.get_stocks_from_database()
-    no_filter_time = time.time() - start_time
+    # Count stocks without filtering (a COUNT query, no symbol list)
+    start_time = time.perf_counter()
+    total_count = analyzer_no_filter.fetcher.count_stocks()
+    no_filter_time = time.perf_counter() - start_time
     
-    print(f"   Filtered stocks: {len(filtered_stocks)} (time: {filtered_time:.3f}s)")
-    print(f"   All stocks: {len(all_stocks)} (time: {no_filter_time:.3f}s)")
-    print(f"   Stocks filtered out: {len(all_stocks) - len(filtered_stocks)}")
-    print(f"   Efficiency gain: {(len(all_stocks) - len(filtered_stocks))/len(all_stocks)*100:.1f}%")
+    print(f"   Filtered stocks: {filtered_count} (time: {filtered_time:.3f}s)")
+    print(f"   All stocks: {total_count} (time: {no_filter_time:.3f}s)")
+    print(f"   Stocks filtered out: {total_count - filtered_count}")
+    print(f"   Efficiency gain: {(total_count - filtered_count)/total_count*100:.1f}%")
     
     # Test 4: Toggle functionality
     print("\n4. Testing TOGGLE functionality:")
@@ -90,9 +91,9 @@ def test_complete_integration():
         print(f"   Has existing price data: {has_price_data}")
     
     return {
-        'filtered_count': len(filtered_stocks),
-        'total_count': len(all_stocks),
-        'efficiency_gain': (len(all_stocks) - len(filtered_stocks))/len(all_stocks)*100,
+        'filtered_count': filtered_count,
+        'total_count': total_count,
+        'efficiency_gain': (total_count - filtered_count)/total_count*100,
         'popular_filtered': len(popular_filtered),
         'popular_total': len(popular_no_filter),
         'setup_success': setup_success,
@@ -111,11 +112,16 @@ def test_filtering_categories():
     # Test series filtering
     print("\n1. Testing SERIES FILTERING:")
     eq_stocks = stock_filter.get_stocks_by_series(['BE', 'BZ'])
-    all_stocks = stock_filter.get_stocks_by_series([])  # No exclusions
+    
+    # Count BE/BZ stocks in SQL instead of fetching the unfiltered list
+    result = stock_filter.db_manager.execute_query(
+        "SELECT COUNT(*) FROM tradable_stocks WHERE series IN ('BE', 'BZ')"
+    )
+    be_bz_count = result[1][0][0] if result and result[1] else 0
     
     print(f"   EQ stocks only: {len(eq_stocks)}")
-    print(f"   All stocks: {len(all_stocks)}")
-    print(f"   BE/BZ stocks filtered: {len(all_stocks) - len(eq_stocks)}")
+    print(f"   All stocks: {len(eq_stocks) + be_bz_count}")
+    print(f"   BE/BZ stocks filtered: {be_bz_count}")
     
     # Test comprehensive filtering
     print("\n2. Testing COMPREHENSIVE FILTERING:")
@@ -141,38 +147,43 @@ def test_performance_impact():
     print("PERFORMANCE IMPACT TEST")
     print("=" * 60)
     
-    # Test multiple iterations to get average performance
-    iterations = 3
+    # Test multiple iterations; the first is a warmup and the median of the rest is reported
+    iterations = 5
     
     print(f"\nTesting {iterations} iterations for average performance...")
     
+    # Build the analyzers once so only the stock query is timed; the stock
+    # list memo is cleared before each call so every iteration runs the query
+    analyzer_f = TechnicalAnalyzer(verbose=False, use_filtering=True)
+    analyzer_n = TechnicalAnalyzer(verbose=False, use_filtering=False)
+    
     # With filtering
     filtered_times = []
     for i in range(iterations):
-        analyzer = TechnicalAnalyzer(verbose=False, use_filtering=True)
-        start_time = time.time()
-        stocks = analyzer.fetcher.get_stocks_from_database()
-        elapsed = time.time() - start_time
+        analyzer_f.fetcher.clear_stock_list_cache()
+        start_time = time.perf_counter()
+        stocks = analyzer_f.fetcher.get_stocks_from_database()
+        elapsed = time.perf_counter() - start_time
         filtered_times.append(elapsed)
         print(f"   Iteration {i+1} (filtered): {len(stocks)} stocks in {elapsed:.3f}s")
     
     # Without filtering
     no_filter_times = []
     for i in range(iterations):
-        analyzer = TechnicalAnalyzer(verbose=False, use_filtering=False)
-        start_time = time.time()
-        stocks = analyzer.fetcher.get_stocks_from_database()
-        elapsed = time.time() - start_time
+        analyzer_n.fetcher.clear_stock_list_cache()
+        start_time = time.perf_counter()
+        stocks = analyzer_n.fetcher.get_stocks_from_database()
+        elapsed = time.perf_counter() - start_time
         no_filter_times.append(elapsed)
         print(f"   Iteration {i+1} (no filter): {len(stocks)} stocks in {elapsed:.3f}s")
     
-    # Calculate averages
-    avg_filtered = sum(filtered_times) / len(filtered_times)
-    avg_no_filter = sum(no_filter_times) / len(no_filter_times)
+    # Median of the warm iterations (falls back to all of them if there is only one)
+    avg_filtered = median(filtered_times[1:] or filtered_times)
+    avg_no_filter = median(no_filter_times[1:] or no_filter_times)
     
     print(f"\nPERFORMANCE RESULTS:")
-    print(f"   Average time (filtered): {avg_filtered:.3f}s")
-    print(f"   Average time (no filter): {avg_no_filter:.3f}s")
+    print(f"   Median warm time (filtered): {avg_filtered:.3f}s")
+    print(f"   Median warm time (no filter): {avg_no_filter:.3f}s")
     print(f"   Performance difference: {abs(avg_filtered - avg_no_filter):.3f}s")
     
     return {
@@ -15,11 +15,12 @@ def test_filtering_integration():
     print("\n1. Testing with filtering ENABLED:")
     fetcher_with_filter = StockDataFetcher(verbose=True, use_filtering=True)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     filtered_stocks = fetcher_with_filter.get_stocks_from_database()
-    filter_time = time.time() - start_time
+    filter_time = time.perf_counter() - start_time
+    filtered_count = len(filtered_stocks)
     
-    print(f"Filtered stocks count: {len(filtered_stocks)}")
+    print(f"Filtered stocks count: {filtered_count}")
     print(f"Time taken: {filter_time:.2f} seconds")
     
     # Get filtering summary
@@ -32,20 +33,21 @@ def test_filtering_integration():
     print("\n2. Testing with filtering DISABLED:")
     fetcher_no_filter = StockDataFetcher(verbose=True, use_filtering=False)
     
-    start_time = time.time()
+    start_time = time.perf_counter()
     all_stocks = fetcher_no_filter.get_stocks_from_database()
-    no_filter_time = time.time() - start_time
+    no_filter_time = time.perf_counter() - start_time
+    total_count = len(all_stocks)
     
-    print(f"All stocks count: {len(all_stocks)}")
+    print(f"All stocks count: {total_count}")
     print(f"Time taken: {no_filter_time:.2f} seconds")
     
     # Compare results
     print("\n3. COMPARISON:")
-    stocks_filtered_out = len(all_stocks) - len(filtered_stocks)
-    efficiency_gain = (stocks_filtered_out / len(all_stocks)) * 100
+    stocks_filtered_out = total_count - filtered_count
+    efficiency_gain = (stocks_filtered_out / total_count) * 100
     
-    print(f"Total stocks: {len(all_stocks)}")
-    print(f"Filtered stocks: {len(filtered_stocks)}")
+    print(f"Total stocks: {total_count}")
+    print(f"Filtered stocks: {filtered_count}")
     print(f"Stocks filtered out: {stocks_filtered_out}")
     print(f"Efficiency gain: {efficiency_gain:.1f}%")
     
@@ -72,8 +74,8 @@ def test_filtering_integration():
     print("INTEGRATION TEST COMPLETE")
     
     return {
-        'filtered_count': len(filtered_stocks),
-        'total_count': len(all_stocks),
+        'filtered_count': filtered_count,
+        'total_count': total_count,
         'efficiency_gain': efficiency_gain,
         'filter_time': filter_time,
         'no_filter_time': no_filter_time
@@ -5,7 +5,7 @@ This script demonstrates the key features without requiring user interaction.
 """
 
 import sys
-from datetime import datetime
+import time
 
 from technical_analysis import TechnicalAnalyzer
 from stock_data_fetcher import StockDataFetcher
@@ -17,7 +17,7 @@ from config import CONSOLE_WIDTH
 def test_stock_dashboard():
     """Test the stock dashboard functionality."""
     print_section_header("STOCK DASHBOARD TEST", CONSOLE_WIDTH)
-    print(f"Test started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Test started at: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     print("-" * CONSOLE_WIDTH)
     
     try:
@@ -62,15 +62,9 @@ def test_stock_dashboard():
         
         # Store data in database
         print("\n5. Storing data in database...")
-        total_records = 0
-        for symbol, data in stock_data.items():
-            if data is not None and not data.empty:
-                if data_manager.insert_price_data(data):
-                    total_records += len(data)
-                
-                # Store indicators
-                indicators_data = data[['symbol', 'date', 'sma_20']].copy()
-                data_manager.insert_indicators_data(indicators_data)
+        # One price upsert and one indicators upsert for the whole batch
+        stored = analyzer.store_batch(stock_data)
+        total_records = sum(len(stock_data[symbol]) for symbol, ok in stored.items() if ok)
         
         print(f"✓ Stored {total_records} price records")
         
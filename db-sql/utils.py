@@ -5,9 +5,13 @@ This module contains common functions used across multiple modules to eliminate
 
 import re
 import os
+import sys
 import platform
 from pathlib import Path
 
+# Runs of whitespace, '-', '.', '&' and '_' (mixed or not) each collapse to one underscore
+_SEPARATOR_RUN_RE = re.compile(r'[\s\-.&_]+')
+
 
 def normalize_column_name(col_name):
     """
@@ -26,22 +30,41 @@ def normalize_column_name(col_name):
     Returns:
         str: The normalized column name in snake_case format
     """
-    # Strip whitespace
-    col_name = col_name.strip()
-    # Replace spaces and special characters with underscores
-    col_name = re.sub(r'[\s\-\.\&]+', '_', col_name)
-    # Convert to lowercase
-    col_name = col_name.lower()
-    # Remove multiple underscores
-    col_name = re.sub(r'_+', '_', col_name)
-    # Remove leading/trailing underscores
-    col_name = col_name.strip('_')
-    return col_name
+    # Replace separator runs with single underscores, then trim the ends
+    return _SEPARATOR_RUN_RE.sub('_', col_name.strip().lower()).strip('_')
+
+
+def _enable_ansi_clear() -> bool:
+    """Check once whether the console understands ANSI escapes (enabling them on Windows if possible)."""
+    if sys.stdout is None or not sys.stdout.isatty():
+        return False
+    if platform.system() != "Windows":
+        return True
+    if os.environ.get('WT_SESSION'):
+        return True  # Windows Terminal always processes VT sequences
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+
+_USE_ANSI_CLEAR = _enable_ansi_clear()
 
 
 def clear_screen():
     """Clear the console screen based on the operating system."""
-    if platform.system() == "Windows":
+    if _USE_ANSI_CLEAR:
+        # Clear and move the cursor home without spawning a shell
+        sys.stdout.write('\033[2J\033[H')
+        sys.stdout.flush()
+    elif platform.system() == "Windows":
         os.system('cls')
     else:
         os.system('clear')
@@ -81,10 +104,8 @@ def print_section_header(title, width=60):
         title (str): The title to display
         width (int): Width of the header line
     """
-    print("=" * width)
-    print(f"  {title}")
-    print("=" * width)
-    print()
+    rule = "=" * width
+    print(f"{rule}\n  {title}\n{rule}\n")
 
 
 def print_step(step_number, description):